@@ -0,0 +1,8 @@
+"""
+pytest configuration: make the project root importable as the src package's parent.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -5,8 +5,11 @@ FastAPI backend for Clinical Trials Pipeline.
 import os
 import sys
 import json
+import hashlib
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
@@ -18,10 +21,25 @@ project_root = os.path.dirname(src_dir)
 sys.path.append(project_root)
 
 from src.database.models import ClinicalStudy, Endpoint, BaselineMeasure
+from src.utils.config import get_database_config
+
+# Open one pooled connection at startup so the first request skips the connect handshake
+@asynccontextmanager
+async def lifespan(app):
+    try:
+        db = get_session_factory()()
+        try:
+            db.execute(text("SELECT 1"))
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"Database warm-up skipped: {e}")
+    yield
 
 # Create FastAPI app
 app = FastAPI(title="Clinical Trials API", 
-              description="API for accessing clinical trial data")
+              description="API for accessing clinical trial data",
+              lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -32,31 +50,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Tag successful GET responses with a content hash so unchanged data can be answered with 304
+@app.middleware("http")
+async def add_etag(request: Request, call_next):
+    response = await call_next(request)
+    if request.method != "GET" or response.status_code != 200:
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # Keep the raw header list so repeated headers such as set-cookie survive; the length is
+    # recomputed for the rebuilt body
+    rebuilt = Response(content=body, status_code=200)
+    rebuilt.raw_headers = [(k, v) for k, v in response.raw_headers if k != b"content-length"]
+    rebuilt.headers["content-length"] = str(len(body))
+    rebuilt.headers["ETag"] = etag
+    return rebuilt
+
+# Build the engine once so its connection pool is shared by every request
+@lru_cache(maxsize=1)
+def get_session_factory():
+    """Create the pooled PostgreSQL engine and its session factory."""
+    engine = create_engine(
+        get_database_config().url,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 # Database connection function with explicit PostgreSQL
 def get_db():
     """Get database session with explicit PostgreSQL connection."""
-    # Load database config
+    # Borrow a session from the shared pool
     try:
-        config_path = os.path.join(project_root, "config", "config.json")
-        with open(config_path, "r") as f:
-            config = json.load(f)
-        db_config = config["database"]
-        
-        # Create PostgreSQL connection string directly
-        connection_string = (
-            f"postgresql://{db_config.get('user')}:{db_config.get('password')}"
-            f"@{db_config.get('host')}:{db_config.get('port')}/{db_config.get('database')}"
-        )
-        
-        # Create engine and session
-        engine = create_engine(connection_string)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        SessionLocal = get_session_factory()
         
         # Create session
         db = SessionLocal()
         try:
-            # Test connection with a simple query
-            db.execute(text("SELECT 1"))
+            # The pool's pre-ping checks the connection when the first query checks it out
             yield db
         except Exception as e:
             print(f"Database error: {e}")
@@ -271,10 +308,35 @@ def compare_endpoint(
 ):
     """Compare a specific endpoint across trials."""
     try:
-        # Try to get data from database
-        endpoints = db.query(Endpoint).filter(Endpoint.name.ilike(f"%{endpoint_name}%")).all()
+        # Try to get data from database, joining each endpoint to its trial in the same query
+        endpoint_query = (
+            db.query(Endpoint, ClinicalStudy)
+            .join(Endpoint.clinical_study)
+            .filter(Endpoint.name.ilike(f"%{endpoint_name}%"))
+        )
         
-        if not endpoints:
+        # Filter by arm if needed
+        if not include_placebo:
+            endpoint_query = endpoint_query.filter(Endpoint.arm == "intervention")
+        
+        # Stream the rows from a server-side cursor
+        result = []
+        for endpoint, trial in endpoint_query.execution_options(yield_per=1000):
+            data = {
+                "nct_id": trial.nct_identifier,
+                "study_title": trial.title,
+                "sponsor": trial.sponsor,
+                "endpoint_name": endpoint.name,
+                "arm": endpoint.arm,
+                "timepoint": endpoint.timepoint,
+                "value": endpoint.average_value,
+                "upper_end": endpoint.upper_end,
+                "lower_end": endpoint.lower_end,
+                "p_value": endpoint.statistical_significance
+            }
+            result.append(data)
+        
+        if not result:
             # Fall back to JSON data for endpoints
             endpoint_data = []
             for trial_data in json_trial_details.values():
@@ -304,30 +366,6 @@ def compare_endpoint(
             else:
                 raise HTTPException(status_code=404, detail=f"No data found for endpoint: {endpoint_name}")
         
-        # Filter by arm if needed
-        if not include_placebo:
-            endpoints = [e for e in endpoints if e.arm == "intervention"]
-        
-        # Get trial information for these endpoints
-        result = []
-        for endpoint in endpoints:
-            trial = db.query(ClinicalStudy).filter(ClinicalStudy.id == endpoint.clinical_study_id).first()
-            
-            if trial:
-                data = {
-                    "nct_id": trial.nct_identifier,
-                    "study_title": trial.title,
-                    "sponsor": trial.sponsor,
-                    "endpoint_name": endpoint.name,
-                    "arm": endpoint.arm,
-                    "timepoint": endpoint.timepoint,
-                    "value": endpoint.average_value,
-                    "upper_end": endpoint.upper_end,
-                    "lower_end": endpoint.lower_end,
-                    "p_value": endpoint.statistical_significance
-                }
-                result.append(data)
-        
         return result
     except HTTPException:
         raise
@@ -5,12 +5,9 @@ Modified to handle real-world data which may be incomplete or inconsistent.
 
 import os
 import sys
-import json
+import orjson
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pathlib import Path
 import re
 
 # Add the project root to the Python path
@@ -21,6 +18,26 @@ sys.path.append(project_root)
 
 from src.utils.paths import get_processed_dir, get_json_dir, get_visualizations_dir
 
+# Matches p-values such as "p<0.05", "p = 0.012", "p<=0.01", "p ≤ 0.05" or "p<.05"
+_PVAL_RE = re.compile(r'p\s*(?:<=|[<=≤])\s*(0?\.\d+)')
+
+
+def is_significant_p_value(p_value):
+    """
+    Check whether a statistical significance string reports p <= 0.05.
+    
+    Args:
+        p_value: Significance string from the trial data (may be None or non-string)
+        
+    Returns:
+        True if the reported p-value is at or below 0.05
+    """
+    if not isinstance(p_value, str):
+        return False
+    
+    p_match = _PVAL_RE.search(p_value.lower())
+    return p_match is not None and float(p_match.group(1)) <= 0.05
+
 
 class EndpointProcessor:
     """Processor for clinical trial endpoint data (real data version)."""
@@ -62,12 +79,12 @@ class EndpointProcessor:
             file_path = os.path.join(self.json_dir, json_file)
             
             try:
-                with open(file_path, 'r') as f:
-                    trial_data = json.load(f)
-                    # Only include trials with endpoint data
-                    if trial_data.get("endpoints") or trial_data.get("baseline_measures"):
-                        trials.append(trial_data)
-            except json.JSONDecodeError:
+                with open(file_path, 'rb') as f:
+                    trial_data = orjson.loads(f.read())
+                # Only include trials with endpoint data
+                if trial_data.get("endpoints") or trial_data.get("baseline_measures"):
+                    trials.append(trial_data)
+            except orjson.JSONDecodeError:
                 print(f"Warning: Could not parse JSON file {file_path}")
                 continue
         
@@ -334,6 +351,8 @@ class EndpointProcessor:
             return None
         
         # Set up the plotting style
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         sns.set_style("whitegrid")
         plt.figure(figsize=(14, 8))
         
@@ -365,18 +384,18 @@ class EndpointProcessor:
                     textcoords='offset points'
                 )
         
-        # Add manual error bars if available
-        for i, row in df_plot.iterrows():
-            if pd.notnull(row["upper_end"]) and pd.notnull(row["lower_end"]):
-                yerr = [[row["average_value"] - row["lower_end"]], [row["upper_end"] - row["average_value"]]]
-                plt.errorbar(
-                    i, 
-                    row["average_value"],
-                    yerr=yerr,
-                    fmt="none", 
-                    color="black",
-                    capsize=5
-                )
+        # Add manual error bars if available, in one call for every row that has both bounds
+        has_range = df_plot["upper_end"].notna() & df_plot["lower_end"].notna()
+        if has_range.any():
+            ranged = df_plot[has_range]
+            plt.errorbar(
+                ranged.index,
+                ranged["average_value"],
+                yerr=[ranged["average_value"] - ranged["lower_end"], ranged["upper_end"] - ranged["average_value"]],
+                fmt="none",
+                color="black",
+                capsize=5
+            )
         
         # Customize the plot
         plt.title(f"Comparison of {endpoint_type} Across PAH Clinical Trials", fontsize=14)
@@ -456,22 +475,7 @@ class EndpointProcessor:
             
             # Check if the effect is statistically significant
             p_value = intervention_row["significance"]
-            is_significant = False
-            
-            # Check for common p-value formats in real data
-            if isinstance(p_value, str):
-                p_value_lower = p_value.lower()
-                if "p<0.05" in p_value_lower or "p = 0.05" in p_value_lower or "p<.05" in p_value_lower:
-                    is_significant = True
-                elif "p=" in p_value_lower or "p =" in p_value_lower:
-                    # Extract the actual p-value if available
-                    p_match = re.search(r'p\s*=\s*(0\.\d+)', p_value_lower)
-                    if p_match:
-                        try:
-                            actual_p = float(p_match.group(1))
-                            is_significant = actual_p < 0.05
-                        except ValueError:
-                            pass
+            is_significant = is_significant_p_value(p_value)
             
             effect_data.append({
                 "nct_id": nct_id,
@@ -488,11 +492,13 @@ class EndpointProcessor:
         effect_df = pd.DataFrame(effect_data)
         
         # Create the chart
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         sns.set_style("whitegrid")
         plt.figure(figsize=(12, 6))
         
         # Determine colors based on significance
-        colors = ["lightgreen" if row["is_significant"] else "lightcoral" for _, row in effect_df.iterrows()]
+        colors = np.where(effect_df["is_significant"], "lightgreen", "lightcoral").tolist()
         
         # Create horizontal bar chart of treatment effects
         ax = sns.barplot(
@@ -503,16 +509,18 @@ class EndpointProcessor:
             orient="h"
         )
         
-        # Add value labels
-        for i, row in effect_df.iterrows():
-            significance_text = row["significance"] if row["significance"] else "Unknown"
+        # Add value labels, with positions computed for all rows at once
+        effects = effect_df["effect"].to_numpy()
+        xs = effects + np.where(effects >= 0, 0.1, -0.1)
+        for i, (x, effect, significance_text) in enumerate(zip(xs, effects, effect_df["significance"].tolist())):
+            significance_text = significance_text if significance_text else "Unknown"
             if isinstance(significance_text, str) and len(significance_text) > 10:
                 significance_text = significance_text[:10] + "..."
                 
             ax.text(
-                row["effect"] + (0.1 if row["effect"] >= 0 else -0.1),
+                x,
                 i,
-                f"{row['effect']:.1f} ({significance_text})",
+                f"{effect:.1f} ({significance_text})",
                 va='center',
                 fontsize=9,
                 color='black'
@@ -768,19 +776,7 @@ class EndpointProcessor:
                 p_value = intervention_data["significance"].values[0] if not intervention_data.empty else "N/A"
                 
                 # Determine if significant
-                is_significant = False
-                if isinstance(p_value, str):
-                    p_value_lower = p_value.lower()
-                    if "p<0.05" in p_value_lower or "p = 0.05" in p_value_lower or "p<.05" in p_value_lower:
-                        is_significant = True
-                    elif "p=" in p_value_lower or "p =" in p_value_lower:
-                        p_match = re.search(r'p\s*=\s*(0\.\d+)', p_value_lower)
-                        if p_match:
-                            try:
-                                actual_p = float(p_match.group(1))
-                                is_significant = actual_p < 0.05
-                            except ValueError:
-                                pass
+                is_significant = is_significant_p_value(p_value)
                 
                 # Get trial name
                 trial_name = trial_data["study"].values[0] if not trial_data.empty else "Unknown"
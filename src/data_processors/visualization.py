@@ -10,15 +10,11 @@ This module creates visualizations for clinical trial data, including:
 
 import os
 import sys
-import json
+import argparse
+import orjson
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.gridspec import GridSpec
-import matplotlib.ticker as mtick
-from pathlib import Path
-import re
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the project root to the Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,7 +23,7 @@ project_root = os.path.dirname(src_dir)
 sys.path.append(project_root)
 
 from src.utils.paths import get_processed_dir, get_json_dir, get_visualizations_dir
-from src.data_processors.endpoint_processor import EndpointProcessor
+from src.data_processors.endpoint_processor import EndpointProcessor, is_significant_p_value
 
 
 class VisualizationGenerator:
@@ -47,10 +43,83 @@ class VisualizationGenerator:
         # Create endpoint processor
         self.endpoint_processor = EndpointProcessor()
         
-        # Set plot style
-        sns.set_theme(style="whitegrid")
-        plt.rcParams['font.family'] = 'sans-serif'
-        plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans']
+        # Plotting modules and the shared figure are loaded on first use
+        self._plt = None
+        self._sns = None
+        self._fig = None
+    
+    def _lazy(self):
+        """
+        Import matplotlib.pyplot and seaborn on first use and apply the plot style.
+        
+        Returns:
+            Tuple of (matplotlib.pyplot, seaborn) modules
+        """
+        if self._plt is None:
+            import matplotlib
+            # Render off-screen unless a backend was explicitly requested
+            if "MPLBACKEND" not in os.environ:
+                matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            
+            # Set plot style
+            sns.set_theme(style="whitegrid")
+            plt.rcParams['font.family'] = 'sans-serif'
+            plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans']
+            
+            self._plt, self._sns = plt, sns
+        return self._plt, self._sns
+        
+    def _get_figure(self, figsize):
+        """
+        Get the shared figure, cleared and resized for a new visualization.
+        
+        Args:
+            figsize: Figure size in inches as (width, height)
+            
+        Returns:
+            Matplotlib figure
+        """
+        plt, _ = self._lazy()
+        if self._fig is None:
+            self._fig = plt.figure(figsize=figsize)
+        else:
+            self._fig.clf()
+            self._fig.set_size_inches(figsize)
+        self._fig.set_layout_engine("constrained")
+        return self._fig
+    
+    def _finish_figure(self, fig, save_path, description, dpi=150):
+        """
+        Save or display a figure, then clear it for the next visualization.
+        
+        Args:
+            fig: Matplotlib figure
+            save_path: Path to save the figure (if None, display instead)
+            description: Description used in the log message
+            dpi: Resolution of the saved image
+            
+        Returns:
+            Path to the saved figure if save_path is provided
+        """
+        plt, _ = self._lazy()
+        if save_path:
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            fig.savefig(save_path, dpi=dpi)
+            fig.clf()
+            print(f"Saved {description} to {save_path}")
+            return save_path
+        else:
+            plt.show()
+            fig.clf()
+            return None
+    
+    def close(self):
+        """Close the shared figure."""
+        if self._fig is not None:
+            self._plt.close(self._fig)
+            self._fig = None
         
     def load_all_trials(self):
         """
@@ -61,41 +130,57 @@ class VisualizationGenerator:
         """
         return self.endpoint_processor.load_all_trials()
     
-    def create_trial_summary_dashboard(self, trials, save_path=None):
+    def create_trial_summary_dashboard(self, trials, save_path=None, dpi=150):
         """
         Create a dashboard summarizing all trials.
         
         Args:
             trials: List of trial data dictionaries
             save_path: Path to save the dashboard (if None, display instead)
+            dpi: Resolution of the saved image
             
         Returns:
             Path to the saved dashboard if save_path is provided
         """
         # Create a figure with subplots
-        fig = plt.figure(figsize=(15, 12))
-        gs = GridSpec(3, 3, figure=fig)
-        
-        # Extract trial information
-        trial_info = []
-        for trial in trials:
-            study_info = trial.get("clinical_study", {})
-            trial_info.append({
-                "nct_id": study_info.get("nct_identifier", "Unknown"),
-                "title": study_info.get("title", "Unknown"),
-                "sponsor": study_info.get("sponsor", "Unknown"),
-                "phase": study_info.get("phase", "Unknown"),
-                "participants": study_info.get("number_of_participants", 0),
-                "avg_age": study_info.get("average_age", 0),
-                "intervention_arms": study_info.get("study_arms", {}).get("intervention", 0),
-                "placebo_arms": study_info.get("study_arms", {}).get("placebo", 0)
+        _, sns = self._lazy()
+        fig = self._get_figure((15, 12))
+        gs = fig.add_gridspec(3, 3)
+        
+        # Extract trial information (flattened study field -> dashboard column)
+        columns = {
+            "nct_identifier": "nct_id",
+            "title": "title",
+            "sponsor": "sponsor",
+            "phase": "phase",
+            "number_of_participants": "participants",
+            "average_age": "avg_age",
+            "study_arms.intervention": "intervention_arms",
+            "study_arms.placebo": "placebo_arms"
+        }
+        df = (
+            pd.json_normalize([trial.get("clinical_study", {}) for trial in trials])
+            .reindex(columns=list(columns))
+            .rename(columns=columns)
+            .fillna({
+                "nct_id": "Unknown",
+                "title": "Unknown",
+                "sponsor": "Unknown",
+                "phase": "Unknown",
+                "participants": 0,
+                "avg_age": 0,
+                "intervention_arms": 0,
+                "placebo_arms": 0
             })
+        )
         
-        df = pd.DataFrame(trial_info)
+        # Bar positions shared by the per-trial panels
+        x = np.arange(len(df))
         
         # 1. Number of participants by trial
         ax1 = fig.add_subplot(gs[0, 0:2])
-        sns.barplot(x="nct_id", y="participants", data=df, ax=ax1, palette="Blues_d")
+        ax1.bar(x, df["participants"], color=sns.color_palette("Blues_d", len(df)))
+        ax1.set_xticks(x, df["nct_id"])
         ax1.set_title("Number of Participants by Trial", fontsize=12)
         ax1.set_xlabel("NCT ID", fontsize=10)
         ax1.set_ylabel("Number of Participants", fontsize=10)
@@ -110,7 +195,8 @@ class VisualizationGenerator:
         
         # 3. Average age by trial
         ax3 = fig.add_subplot(gs[1, 0])
-        sns.barplot(x="nct_id", y="avg_age", data=df, ax=ax3, palette="Greens_d")
+        ax3.bar(x, df["avg_age"], color=sns.color_palette("Greens_d", len(df)))
+        ax3.set_xticks(x, df["nct_id"])
         ax3.set_title("Average Age of Participants", fontsize=12)
         ax3.set_xlabel("NCT ID", fontsize=10)
         ax3.set_ylabel("Average Age (years)", fontsize=10)
@@ -118,42 +204,33 @@ class VisualizationGenerator:
         
         # 4. Intervention vs. Placebo Arms
         ax4 = fig.add_subplot(gs[1, 1:3])
-        df_arms = pd.melt(df, id_vars=["nct_id"], value_vars=["intervention_arms", "placebo_arms"],
-                          var_name="arm_type", value_name="count")
-        sns.barplot(x="nct_id", y="count", hue="arm_type", data=df_arms, ax=ax4, palette=["steelblue", "lightgray"])
+        width = 0.4
+        ax4.bar(x - width / 2, df["intervention_arms"], width, color="steelblue", label="Intervention")
+        ax4.bar(x + width / 2, df["placebo_arms"], width, color="lightgray", label="Placebo")
+        ax4.set_xticks(x, df["nct_id"])
         ax4.set_title("Number of Intervention and Placebo Arms by Trial", fontsize=12)
         ax4.set_xlabel("NCT ID", fontsize=10)
         ax4.set_ylabel("Number of Arms", fontsize=10)
         ax4.tick_params(axis='x', rotation=45)
-        ax4.legend(title="Arm Type", labels=["Intervention", "Placebo"])
+        ax4.legend(title="Arm Type")
         
         # 5. Sponsors
         ax5 = fig.add_subplot(gs[2, 0:3])
-        sponsor_counts = df["sponsor"].value_counts().reset_index()
-        sponsor_counts.columns = ["sponsor", "count"]
-        sns.barplot(x="sponsor", y="count", data=sponsor_counts, ax=ax5, palette="Blues_d")
+        sponsor_counts = df["sponsor"].value_counts().rename_axis("sponsor").reset_index(name="count")
+        ax5.bar(sponsor_counts["sponsor"], sponsor_counts["count"],
+                color=sns.color_palette("Blues_d", len(sponsor_counts)))
         ax5.set_title("Number of Trials by Sponsor", fontsize=12)
         ax5.set_xlabel("Sponsor", fontsize=10)
         ax5.set_ylabel("Number of Trials", fontsize=10)
         ax5.tick_params(axis='x', rotation=45)
         
         # Add title to the entire figure
-        fig.suptitle("Clinical Trial Summary Dashboard", fontsize=16, y=0.98)
-        plt.tight_layout(rect=[0, 0, 1, 0.96])
+        fig.suptitle("Clinical Trial Summary Dashboard", fontsize=16)
         
         # Save or display the figure
-        if save_path:
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches="tight")
-            plt.close()
-            print(f"Saved dashboard to {save_path}")
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._finish_figure(fig, save_path, "dashboard", dpi)
     
-    def create_endpoint_comparison_grid(self, trials, top_n=3, save_path=None):
+    def create_endpoint_comparison_grid(self, trials, top_n=3, save_path=None, dpi=150):
         """
         Create a grid of visualizations for the top endpoints.
         
@@ -161,6 +238,7 @@ class VisualizationGenerator:
             trials: List of trial data dictionaries
             top_n: Number of top endpoints to visualize
             save_path: Path to save the grid (if None, display instead)
+            dpi: Resolution of the saved image
             
         Returns:
             Path to the saved grid if save_path is provided
@@ -178,10 +256,9 @@ class VisualizationGenerator:
         n_rows = (n_endpoints + n_cols - 1) // n_cols
         
         # Create figure with subplots
-        fig, axes = plt.subplots(n_rows, n_cols, figsize=(15, 6 * n_rows))
-        if n_rows * n_cols == 1:  # Handle single subplot case
-            axes = np.array([axes])
-        axes = axes.flatten()
+        _, sns = self._lazy()
+        fig = self._get_figure((15, 6 * n_rows))
+        axes = fig.subplots(n_rows, n_cols, squeeze=False).flatten()
         
         # Create a visualization for each endpoint
         for i, endpoint in enumerate(common_endpoints):
@@ -199,7 +276,7 @@ class VisualizationGenerator:
                 continue
             
             # Filter for valid numeric data
-            df_plot = df.dropna(subset=['average_value']).copy()
+            df_plot = _to_categorical(df.dropna(subset=['average_value']), ["nct_id", "arm"])
             
             if df_plot.empty:
                 axes[i].text(0.5, 0.5, f"No numeric data for {endpoint}", 
@@ -248,28 +325,95 @@ class VisualizationGenerator:
             fig.delaxes(axes[i])
         
         # Add title to the entire figure
-        fig.suptitle("Endpoint Comparisons Across PAH Clinical Trials", fontsize=16, y=0.98)
-        plt.tight_layout(rect=[0, 0, 1, 0.96])
+        fig.suptitle("Endpoint Comparisons Across PAH Clinical Trials", fontsize=16)
         
         # Save or display the figure
-        if save_path:
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches="tight")
-            plt.close()
-            print(f"Saved endpoint comparison grid to {save_path}")
-            return save_path
-        else:
-            plt.show()
-            plt.close()
+        return self._finish_figure(fig, save_path, "endpoint comparison grid", dpi)
+    
+    def _draw_heatmap_datashader(self, fig, pivot_df, significance_pivot):
+        """
+        Rasterize a treatment effect pivot with datashader and draw it on the figure.
+        
+        Each cell is labelled at its centre with its effect value, followed by
+        "*" when it is statistically significant, like the seaborn heatmap.
+        
+        Args:
+            fig: Matplotlib figure to draw on
+            pivot_df: Pivoted DataFrame of effects (trials x endpoints)
+            significance_pivot: Pivoted DataFrame of significance flags, same shape
+            
+        Returns:
+            The heatmap axes, or None if datashader is not installed
+        """
+        try:
+            import datashader as ds
+            import datashader.transfer_functions as tf
+            import xarray as xr
+        except ImportError:
+            print("datashader is not installed; falling back to seaborn heatmap.")
             return None
+        
+        plt, _ = self._lazy()
+        n_trials, n_endpoints = pivot_df.shape
+        values = pivot_df.to_numpy(dtype=float)
+        
+        # Symmetric color span so that zero effect maps to the center of the colormap
+        limit = np.nanmax(np.abs(values)) if np.isfinite(values).any() else 1.0
+        norm = plt.Normalize(vmin=-limit, vmax=limit)
+        cmap = plt.get_cmap("RdBu_r")
+        
+        data_array = xr.DataArray(
+            values,
+            dims=("trial", "endpoint"),
+            name="effect",
+            coords={"trial": np.arange(n_trials) + 0.5, "endpoint": np.arange(n_endpoints) + 0.5}
+        )
+        canvas = ds.Canvas(
+            plot_width=800,
+            plot_height=400,
+            x_range=(0, n_endpoints),
+            y_range=(0, n_trials)
+        )
+        agg = canvas.quadmesh(data_array, x="endpoint", y="trial")
+        img = tf.shade(agg, cmap=cmap, how="linear", span=(-limit, limit))
+        
+        # Unpack datashader's packed RGBA uint32 pixels into an (H, W, 4) array
+        rgba = img.data.view(np.uint8).reshape(img.shape + (4,))
+        
+        ax = fig.add_subplot(1, 1, 1)
+        ax.imshow(rgba, origin="lower", extent=(0, n_endpoints, 0, n_trials), aspect="auto")
+        ax.invert_yaxis()
+        
+        # Match seaborn's cell-centered tick layout so annotations line up
+        ax.set_xticks(np.arange(n_endpoints) + 0.5)
+        ax.set_xticklabels(pivot_df.columns)
+        ax.set_yticks(np.arange(n_trials) + 0.5)
+        ax.set_yticklabels(pivot_df.index)
+        ax.grid(False)
+        
+        # Annotate values at the cell centres, switching to white text on the darkest colours
+        significant = significance_pivot.reindex_like(pivot_df).fillna(False).to_numpy(dtype=bool)
+        for i, j in zip(*np.nonzero(np.isfinite(values))):
+            value = values[i, j]
+            ax.text(j + 0.5, i + 0.5, f"{value:.1f}{' *' if significant[i, j] else ''}",
+                    color="white" if abs(value) > 0.6 * limit else "black",
+                    ha="center", va="center", fontsize=10)
+        
+        colorbar = fig.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap), ax=ax)
+        colorbar.set_label("Treatment Effect (Intervention - Placebo)")
+        
+        return ax
     
-    def create_treatment_effect_heatmap(self, trials, save_path=None):
+    def create_treatment_effect_heatmap(self, trials, save_path=None, backend="matplotlib", dpi=150):
         """
         Create a heatmap showing treatment effects across trials and endpoints.
         
         Args:
             trials: List of trial data dictionaries
             save_path: Path to save the heatmap (if None, display instead)
+            backend: Rendering backend, "matplotlib" (seaborn) or "datashader"
+                for large trial/endpoint grids
+            dpi: Resolution of the saved image
             
         Returns:
             Path to the saved heatmap if save_path is provided
@@ -281,6 +425,8 @@ class VisualizationGenerator:
             print("No endpoint data found.")
             return None
         
+        all_endpoints_df = _to_categorical(all_endpoints_df, ["nct_id", "arm", "endpoint"])
+        
         # Get unique normalized endpoints
         unique_endpoints = all_endpoints_df["endpoint"].unique()
         
@@ -288,44 +434,33 @@ class VisualizationGenerator:
         trial_ids = [t.get("clinical_study", {}).get("nct_identifier", "Unknown") for t in trials]
         trial_ids = [tid for tid in trial_ids if tid != "Unknown"]
         
+        # Index the first row of each (endpoint, trial, arm) group once
+        first_rows = all_endpoints_df.drop_duplicates(subset=["endpoint", "nct_id", "arm"]).set_index(
+            ["endpoint", "nct_id", "arm"]
+        )
+        values = first_rows["average_value"].to_dict()
+        significances = first_rows["significance"].to_dict()
+        
         # Create a DataFrame to store treatment effects
         heatmap_data = []
         
         for endpoint in unique_endpoints:
-            endpoint_df = all_endpoints_df[all_endpoints_df["endpoint"] == endpoint]
-            
             for trial_id in trial_ids:
-                trial_data = endpoint_df[endpoint_df["nct_id"] == trial_id]
+                intervention_key = (endpoint, trial_id, "intervention")
+                placebo_key = (endpoint, trial_id, "placebo")
                 
                 # Get intervention and placebo data
-                intervention_data = trial_data[trial_data["arm"] == "intervention"]
-                placebo_data = trial_data[trial_data["arm"] == "placebo"]
-                
-                if not intervention_data.empty and not placebo_data.empty:
-                    int_value = intervention_data["average_value"].values[0]
-                    placebo_value = placebo_data["average_value"].values[0]
+                if intervention_key in values and placebo_key in values:
+                    int_value = values[intervention_key]
+                    placebo_value = values[placebo_key]
                     
                     if pd.notnull(int_value) and pd.notnull(placebo_value):
                         # Calculate effect (treatment - placebo)
                         effect = int_value - placebo_value
                         
                         # Get p-value
-                        p_value = intervention_data["significance"].values[0]
-                        is_significant = False
-                        
-                        # Check for common p-value formats
-                        if isinstance(p_value, str):
-                            p_value_lower = p_value.lower()
-                            if "p<0.05" in p_value_lower or "p = 0.05" in p_value_lower or "p<.05" in p_value_lower:
-                                is_significant = True
-                            elif "p=" in p_value_lower or "p =" in p_value_lower:
-                                p_match = re.search(r'p\s*=\s*(0\.\d+)', p_value_lower)
-                                if p_match:
-                                    try:
-                                        actual_p = float(p_match.group(1))
-                                        is_significant = actual_p < 0.05
-                                    except ValueError:
-                                        pass
+                        p_value = significances[intervention_key]
+                        is_significant = is_significant_p_value(p_value)
                         
                         heatmap_data.append({
                             "trial_id": trial_id,
@@ -353,49 +488,49 @@ class VisualizationGenerator:
         )
         
         # Create the figure
-        plt.figure(figsize=(12, 8))
+        plt, sns = self._lazy()
+        fig = self._get_figure((12, 8))
         
         # Create heatmap
-        ax = sns.heatmap(
-            pivot_df,
-            cmap="RdBu_r",
-            center=0,
-            annot=True,
-            fmt=".1f",
-            linewidths=.5,
-            cbar_kws={"label": "Treatment Effect (Intervention - Placebo)"}
-        )
-        
-        # Add markers for statistical significance
-        for i, idx in enumerate(pivot_df.index):
-            for j, col in enumerate(pivot_df.columns):
-                if significance_pivot.loc[idx, col]:
-                    ax.text(j + 0.5, i + 0.85, '*', color='black', 
-                           ha='center', va='center', fontsize=16)
+        ax = None
+        if backend == "datashader":
+            ax = self._draw_heatmap_datashader(fig, pivot_df, significance_pivot)
+        
+        if ax is None:
+            ax = sns.heatmap(
+                pivot_df,
+                ax=fig.add_subplot(1, 1, 1),
+                cmap="RdBu_r",
+                center=0,
+                annot=True,
+                fmt=".1f",
+                linewidths=.5,
+                cbar_kws={"label": "Treatment Effect (Intervention - Placebo)"}
+            )
+            
+            # Add markers for statistical significance below the annotated values
+            for i, idx in enumerate(pivot_df.index):
+                for j, col in enumerate(pivot_df.columns):
+                    if significance_pivot.loc[idx, col]:
+                        ax.text(j + 0.5, i + 0.85, '*', color='black', 
+                               ha='center', va='center', fontsize=16)
         
         # Customize plot
-        plt.title("Treatment Effect Heatmap Across PAH Clinical Trials", fontsize=14)
-        plt.ylabel("Clinical Trial (NCT ID)", fontsize=12)
-        plt.xlabel("Endpoint", fontsize=12)
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
+        ax.set_title("Treatment Effect Heatmap Across PAH Clinical Trials", fontsize=14)
+        ax.set_ylabel("Clinical Trial (NCT ID)", fontsize=12)
+        ax.set_xlabel("Endpoint", fontsize=12)
+        ax.tick_params(axis='x', labelrotation=45)
+        # seaborn rotates the trial labels when they overlap before constrained layout sizes the axes
+        ax.tick_params(axis='y', labelrotation=0)
+        plt.setp(ax.get_xticklabels(), ha="right")
         
         # Add a note about significance
-        plt.figtext(0.01, 0.01, "* Statistically significant (p<0.05)", fontsize=9)
+        fig.text(0.01, 0.01, "* Statistically significant (p≤0.05)", fontsize=9)
         
         # Save or display the figure
-        if save_path:
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches="tight")
-            plt.close()
-            print(f"Saved treatment effect heatmap to {save_path}")
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._finish_figure(fig, save_path, "treatment effect heatmap", dpi)
     
-    def create_baseline_comparison(self, trials, measure_type=None, save_path=None):
+    def create_baseline_comparison(self, trials, measure_type=None, save_path=None, dpi=150):
         """
         Create a comparison of baseline measures across trials.
         
@@ -403,6 +538,7 @@ class VisualizationGenerator:
             trials: List of trial data dictionaries
             measure_type: Type of baseline measure to compare (if None, use the most common)
             save_path: Path to save the comparison (if None, display instead)
+            dpi: Resolution of the saved image
             
         Returns:
             Path to the saved comparison if save_path is provided
@@ -433,7 +569,8 @@ class VisualizationGenerator:
             return None
         
         # Create the figure
-        plt.figure(figsize=(14, 8))
+        plt, sns = self._lazy()
+        fig = self._get_figure((14, 8))
         
         # Create a grouped bar chart
         ax = sns.barplot(
@@ -441,6 +578,7 @@ class VisualizationGenerator:
             y="average_value",
             hue="arm",
             data=baseline_df,
+            ax=fig.add_subplot(1, 1, 1),
             palette={"intervention": "steelblue", "placebo": "lightgray"},
             errorbar=None
         )
@@ -460,45 +598,54 @@ class VisualizationGenerator:
                     textcoords='offset points'
                 )
         
-        # Add error bars if available
-        for i, row in baseline_df.iterrows():
-            if pd.notnull(row["upper_end"]) and pd.notnull(row["lower_end"]):
-                yerr = [[row["average_value"] - row["lower_end"]], [row["upper_end"] - row["average_value"]]]
-                plt.errorbar(
-                    i, 
-                    row["average_value"],
-                    yerr=yerr,
-                    fmt="none", 
-                    color="black",
-                    capsize=5
-                )
+        # Add error bars if available, positioned at the center of each hue-dodged bar
+        categories = {label.get_text(): i for i, label in enumerate(ax.get_xticklabels())}
+        hue_levels = {arm: k for k, arm in enumerate(baseline_df["arm"].unique())}
+        bar_width = 0.8 / len(hue_levels)
+        x = (
+            baseline_df["nct_id"].map(categories).to_numpy(dtype=float)
+            + (baseline_df["arm"].map(hue_levels).to_numpy(dtype=float) + 0.5) * bar_width
+            - 0.4
+        )
+        avg = baseline_df["average_value"].to_numpy(dtype=float)
+        lower = baseline_df["lower_end"].to_numpy(dtype=float)
+        upper = baseline_df["upper_end"].to_numpy(dtype=float)
+        mask = ~(np.isnan(lower) | np.isnan(upper))
+        
+        if mask.any():
+            ax.errorbar(
+                x[mask],
+                avg[mask],
+                yerr=np.stack([(avg - lower)[mask], (upper - avg)[mask]]),
+                fmt="none",
+                color="black",
+                capsize=5
+            )
         
         # Customize plot
-        plt.title(f"Baseline {measure_type} Comparison Across PAH Clinical Trials", fontsize=14)
-        plt.xlabel("Clinical Trial (NCT ID)", fontsize=12)
-        plt.ylabel(f"Baseline {measure_type} Value", fontsize=12)
-        plt.xticks(rotation=45, ha="right")
-        plt.legend(title="Treatment Arm")
-        plt.tight_layout()
+        ax.set_title(f"Baseline {measure_type} Comparison Across PAH Clinical Trials", fontsize=14)
+        ax.set_xlabel("Clinical Trial (NCT ID)", fontsize=12)
+        ax.set_ylabel(f"Baseline {measure_type} Value", fontsize=12)
+        ax.tick_params(axis='x', labelrotation=45)
+        plt.setp(ax.get_xticklabels(), ha="right")
+        ax.legend(title="Treatment Arm")
         
         # Save or display the figure
-        if save_path:
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            plt.savefig(save_path, dpi=300, bbox_inches="tight")
-            plt.close()
-            print(f"Saved baseline comparison to {save_path}")
-            return save_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._finish_figure(fig, save_path, "baseline comparison", dpi)
     
-    def create_all_visualizations(self, output_dir=None):
+    def create_all_visualizations(self, output_dir=None, max_workers=None, dpi=150, heatmap_backend="matplotlib"):
         """
         Create all visualizations for the clinical trial data.
         
+        Figures are independent of each other, so they are rendered in
+        separate worker processes.
+        
         Args:
             output_dir: Directory to save visualizations (default: visualizations_dir)
+            max_workers: Maximum number of worker processes (default: one per figure,
+                capped at the CPU count)
+            dpi: Resolution of the saved images
+            heatmap_backend: Treatment effect heatmap backend, "matplotlib" or "datashader"
             
         Returns:
             List of paths to saved visualizations
@@ -515,38 +662,48 @@ class VisualizationGenerator:
             print("No trial data found. Please run trial_processor.py first.")
             return []
         
-        visualization_paths = []
-        
-        # 1. Create trial summary dashboard
-        dashboard_path = os.path.join(output_dir, "trial_summary_dashboard.png")
-        path = self.create_trial_summary_dashboard(trials, save_path=dashboard_path)
-        if path:
-            visualization_paths.append(path)
-        
-        # 2. Create endpoint comparison grid
-        grid_path = os.path.join(output_dir, "endpoint_comparison_grid.png")
-        path = self.create_endpoint_comparison_grid(trials, save_path=grid_path)
-        if path:
-            visualization_paths.append(path)
-        
-        # 3. Create treatment effect heatmap
-        heatmap_path = os.path.join(output_dir, "treatment_effect_heatmap.png")
-        path = self.create_treatment_effect_heatmap(trials, save_path=heatmap_path)
-        if path:
-            visualization_paths.append(path)
-        
-        # 4. Create baseline comparisons for common measures
+        # Each job is (method name, keyword arguments)
+        jobs = [
+            # 1. Trial summary dashboard
+            ("create_trial_summary_dashboard",
+             {"save_path": os.path.join(output_dir, "trial_summary_dashboard.png"), "dpi": dpi}),
+            # 2. Endpoint comparison grid
+            ("create_endpoint_comparison_grid",
+             {"save_path": os.path.join(output_dir, "endpoint_comparison_grid.png"), "dpi": dpi}),
+            # 3. Treatment effect heatmap
+            ("create_treatment_effect_heatmap",
+             {"save_path": os.path.join(output_dir, "treatment_effect_heatmap.png"), "dpi": dpi,
+              "backend": heatmap_backend}),
+        ]
+        
+        # 4. Baseline comparisons for common measures
         baseline_df = self.endpoint_processor.extract_baseline_data(trials)
         if not baseline_df.empty:
             measure_counts = baseline_df['measure'].value_counts()
-            for i, measure in enumerate(measure_counts.index[:3]):  # Top 3 measures
+            for measure in measure_counts.index[:3]:  # Top 3 measures
                 baseline_path = os.path.join(output_dir, f"baseline_{measure.replace(' ', '_')}_comparison.png")
-                path = self.create_baseline_comparison(trials, measure, save_path=baseline_path)
-                if path:
-                    visualization_paths.append(path)
+                jobs.append(("create_baseline_comparison",
+                             {"measure_type": measure, "save_path": baseline_path, "dpi": dpi}))
+        
+        if max_workers is None:
+            max_workers = min(len(jobs), os.cpu_count() or 1)
+        
+        # Serialize trials once rather than pickling the nested dicts per job
+        trials_blob = orjson.dumps(trials)
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_render_visualization, method_name, trials_blob, kwargs)
+                for method_name, kwargs in jobs
+            ]
+            
+            # 5. Render the endpoint processor visualizations while the workers run
+            self._lazy()  # Select the backend and style before the endpoint processor draws
+            ep_paths = self.endpoint_processor.visualize_all_common_endpoints(trials, output_dir=output_dir)
+            
+            # Collect in submission order so the output listing is stable
+            visualization_paths = [path for path in (f.result() for f in futures) if path]
         
-        # 5. Also include the visualizations from the endpoint processor
-        ep_paths = self.endpoint_processor.visualize_all_common_endpoints(trials, output_dir=output_dir)
         if ep_paths:
             visualization_paths.extend(ep_paths)
         
@@ -557,13 +714,62 @@ class VisualizationGenerator:
         return visualization_paths
 
 
+def _to_categorical(df, columns):
+    """
+    Convert repeating key columns to categorical dtype for faster grouping.
+    
+    Categories keep their order of first appearance, so plots built from the
+    result order their bars the same way as with the original string columns.
+    
+    Args:
+        df: DataFrame to convert
+        columns: Names of the columns to convert
+        
+    Returns:
+        Copy of the DataFrame with the given columns as categoricals
+    """
+    return df.assign(**{
+        column: pd.Categorical(df[column], categories=df[column].dropna().unique())
+        for column in columns
+    })
+
+
+# Generator instance owned by a worker process (see _render_visualization)
+_worker_generator = None
+
+
+def _render_visualization(method_name, trials_blob, kwargs):
+    """
+    Render a single visualization in a worker process.
+    
+    Args:
+        method_name: Name of the VisualizationGenerator method to call
+        trials_blob: orjson-encoded list of trial data dictionaries
+        kwargs: Keyword arguments for the method
+        
+    Returns:
+        Path to the saved visualization, or None if nothing was created
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        # One generator per worker process so its figure is reused across jobs
+        _worker_generator = VisualizationGenerator()
+    
+    trials = orjson.loads(trials_blob)
+    return getattr(_worker_generator, method_name)(trials, **kwargs)
+
 def main():
     """Main entry point for visualization generation."""
+    parser = argparse.ArgumentParser(description="Generate clinical trial visualizations")
+    parser.add_argument("--heatmap-backend", choices=["matplotlib", "datashader"], default="matplotlib",
+                        help="Backend for the treatment effect heatmap (datashader suits large grids)")
+    args = parser.parse_args()
+    
     # Initialize the visualization generator
     generator = VisualizationGenerator()
     
     # Create all visualizations
-    visualization_paths = generator.create_all_visualizations()
+    visualization_paths = generator.create_all_visualizations(heatmap_backend=args.heatmap_backend)
     
     if not visualization_paths:
         print("No visualizations were created. Please check if trial data is available.")
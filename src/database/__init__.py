@@ -2,9 +2,14 @@
 Database connection utilities.
 """
 
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+def _json_serializer(value):
+    """Serialize JSON/JSONB column values with orjson."""
+    return orjson.dumps(value).decode()
+
 def get_engine(config):
     """
     Create a database engine from config.
@@ -15,18 +20,30 @@ def get_engine(config):
     Returns:
         SQLAlchemy engine
     """
-    db_url = f"postgresql://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
-    return create_engine(db_url)
+    db_url = f"postgresql+psycopg2://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
+    
+    # Send executemany() batches as multi-row VALUES pages rather than one INSERT per row
+    return create_engine(
+        db_url,
+        executemany_mode="values_plus_batch",
+        executemany_batch_page_size=500,
+        insertmanyvalues_page_size=1000,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads
+    )
 
 def get_session(engine):
     """
     Create a database session.
     
+    The session is used for bulk writes it never reads back, so autoflush
+    and expire-on-commit are turned off.
+    
     Args:
         engine: SQLAlchemy engine
         
     Returns:
         SQLAlchemy session
     """
-    Session = sessionmaker(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
     return Session()
\ No newline at end of file
@@ -3,24 +3,62 @@ Load JSON data into PostgreSQL database.
 """
 
 import os
-import json
 import sys
+import io
+import csv
+import mmap
+import orjson
 from pathlib import Path
 import argparse
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the project root to the Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.append(project_root)
 
+from sqlalchemy import select, text
+
 from src.database.models import Base, ClinicalStudy, Endpoint, BaselineMeasure, SECFiling, Publication
 from src.database import get_engine, get_session
 
+# Rows per table sent in a single bulk insert
+BATCH_SIZE = 1000
+
+# Hash partitions created for each table declared with postgresql_partition_by
+PARTITION_COUNT = 8
+
+# Studies whose IDs are reserved and inserted together
+STUDY_BATCH_SIZE = 100
+
+# JSON fields copied unchanged into the endpoint and baseline rows
+ENDPOINT_KEYS = ("name", "description", "timepoint", "arm", "average_value",
+                 "upper_end", "lower_end", "statistical_significance")
+BASELINE_KEYS = ("name", "description", "arm", "average_value", "upper_end", "lower_end")
+
+# Indexes and foreign keys dropped while COPY fills empty tables, as (drop, recreate) statements
+CHILD_TABLES = ["endpoints", "baseline_measures", "sec_filings", "publications"]
+DEFERRED_DDL = [
+    ("DROP INDEX ix_clinical_study_nct_identifier",
+     "CREATE UNIQUE INDEX ix_clinical_study_nct_identifier ON clinical_study (nct_identifier)"),
+    ("DROP INDEX ix_sec_filings_contexts",
+     "CREATE INDEX ix_sec_filings_contexts ON sec_filings USING gin (contexts)"),
+] + [
+    (f"ALTER TABLE {table} DROP CONSTRAINT {table}_clinical_study_id_fkey",
+     f"ALTER TABLE {table} ADD CONSTRAINT {table}_clinical_study_id_fkey "
+     f"FOREIGN KEY (clinical_study_id) REFERENCES clinical_study (id)")
+    for table in CHILD_TABLES
+]
+
+# Marker written for None values in COPY buffers so empty strings stay empty strings
+COPY_NULL = "\\N"
+
 def load_config():
     """Load database configuration from config file."""
     config_path = os.path.join(project_root, "config", "config.json")
-    with open(config_path, "r") as f:
-        config = json.load(f)
+    with open(config_path, "rb") as f:
+        config = orjson.loads(f.read())
     return config["database"]
 
 def drop_tables(engine):
@@ -28,135 +66,397 @@ def drop_tables(engine):
     Base.metadata.drop_all(engine)
     print("Dropped existing tables.")
 
+def _partitioned_tables():
+    """Names of the tables declared with postgresql_partition_by."""
+    return [table.name for table in Base.metadata.sorted_tables
+            if table.dialect_options["postgresql"]["partition_by"]]
+
+def _storage_tables():
+    """Names of the tables that hold rows: unpartitioned tables and every partition."""
+    partitioned = _partitioned_tables()
+    tables = [table.name for table in Base.metadata.sorted_tables if table.name not in partitioned]
+    tables += [f"{table}_p{remainder}" for table in partitioned for remainder in range(PARTITION_COUNT)]
+    return tables
+
 def create_tables(engine):
-    """Create database tables."""
+    """Create database tables and the hash partitions of the partitioned child tables."""
     Base.metadata.create_all(engine)
+    
+    with engine.begin() as conn:
+        for table in _partitioned_tables():
+            for remainder in range(PARTITION_COUNT):
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {table}_p{remainder} PARTITION OF {table} "
+                    f"FOR VALUES WITH (MODULUS {PARTITION_COUNT}, REMAINDER {remainder})"
+                ))
     print("Database tables created.")
 
-def load_json_data(json_dir, session):
+def _parse_file(file_path):
+    """Read and parse a single JSON file (runs in a worker process)."""
+    # Parse straight from the page cache instead of copying the file into a bytes object
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+def _flush_rows(session, pending, min_rows=1):
+    """
+    Insert the pending child rows for every table that has at least min_rows queued.
+    
+    Rows go through Core executemany inserts; every row of a table must
+    carry the same keys.
+    
+    Args:
+        session: SQLAlchemy session
+        pending: Dictionary mapping model classes to lists of row dictionaries
+        min_rows: Minimum number of queued rows before a table is flushed
+    """
+    for model, rows in pending.items():
+        if rows and len(rows) >= min_rows:
+            session.execute(model.__table__.insert(), rows)
+            rows.clear()
+
+def _parse_json_dir(json_dir, max_workers=None):
+    """
+    Parse every NCT*.json file in a directory using worker processes.
+    
+    Args:
+        json_dir: Directory containing JSON files
+        max_workers: Number of parsing processes (defaults to CPU count - 1)
+        
+    Yields:
+        (file name, parsed data) tuples in directory order
+    """
+    with os.scandir(json_dir) as entries:
+        matches = [(entry.name, entry.path) for entry in entries
+                   if entry.name[:3] == 'NCT' and entry.name.endswith('.json') and entry.is_file()]
+    json_files = [name for name, _ in matches]
+    file_paths = [path for _, path in matches]
+    
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) - 1)
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from zip(json_files, executor.map(_parse_file, file_paths, chunksize=8))
+
+def load_json_data(json_dir, session, max_workers=None):
     """
     Load all JSON files from a directory into the database.
     
+    Files are parsed in worker processes; only the main process talks to
+    the database session.
+    
     Args:
         json_dir: Directory containing JSON files
         session: SQLAlchemy session
+        max_workers: Number of parsing processes (defaults to CPU count - 1)
     """
-    json_files = [f for f in os.listdir(json_dir) if f.endswith('.json') and f.startswith('NCT')]
+    # Studies and their child rows are queued and inserted in batches
+    batch = []
+    pending = {Endpoint: [], BaselineMeasure: [], SECFiling: [], Publication: []}
     
-    for json_file in json_files:
-        file_path = os.path.join(json_dir, json_file)
-        
-        print(f"Processing {json_file}...")
-        
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+    # One transaction for the whole load, committed when the block exits
+    with session.begin():
+        for json_file, data in _parse_json_dir(json_dir, max_workers):
+            print(f"Processing {json_file}...")
+            
+            batch.append(data)
+            if len(batch) >= STUDY_BATCH_SIZE:
+                load_studies_batch(batch, session, pending)
+                batch = []
+                _flush_rows(session, pending, BATCH_SIZE)
         
-        # Extract clinical study data
-        process_clinical_study(data, session)
+        if batch:
+            load_studies_batch(batch, session, pending)
+        _flush_rows(session, pending)
     
-    # Commit all changes
-    session.commit()
     print("All data loaded successfully.")
 
-def process_clinical_study(data, session):
+def load_studies_batch(data_list, session, pending):
     """
-    Process clinical study data and insert into database.
+    Insert a batch of clinical studies with IDs reserved from the sequence up front.
+    
+    Existing studies are found with one query per batch and IDs come from a
+    single nextval call, so no per-study round trip is needed before the
+    child rows can be queued.
     
     Args:
-        data: Clinical study data dictionary
+        data_list: List of clinical study data dictionaries
         session: SQLAlchemy session
+        pending: Dictionary mapping model classes to lists of queued row dictionaries
     """
-    clinical_study_data = data.get("clinical_study", {})
+    study_rows = [_study_row(data.get("clinical_study", {})) for data in data_list]
     
-    # Check if this study already exists
-    existing_study = session.query(ClinicalStudy).filter_by(
-        nct_identifier=clinical_study_data.get("nct_identifier")
-    ).first()
+    existing = set(session.execute(
+        select(ClinicalStudy.nct_identifier).where(
+            ClinicalStudy.nct_identifier.in_([row["nct_identifier"] for row in study_rows])
+        )
+    ).scalars())
     
-    if existing_study:
-        print(f"Study {clinical_study_data.get('nct_identifier')} already exists. Skipping.")
+    new_studies = []
+    for data, study_row in zip(data_list, study_rows):
+        nct_identifier = study_row["nct_identifier"]
+        if nct_identifier in existing:
+            print(f"Study {nct_identifier} already exists. Skipping.")
+            continue
+        existing.add(nct_identifier)
+        new_studies.append((data, study_row))
+    
+    if not new_studies:
         return
     
-    # Create clinical study record
-    study = ClinicalStudy(
-        title=clinical_study_data.get("title"),
-        nct_identifier=clinical_study_data.get("nct_identifier"),
-        indication=clinical_study_data.get("indication"),
-        intervention=clinical_study_data.get("intervention"),
+    ids = session.execute(
+        text("SELECT nextval('clinical_study_id_seq') FROM generate_series(1, :n)"),
+        {"n": len(new_studies)}
+    ).scalars().all()
+    
+    for study_id, (data, study_row) in zip(ids, new_studies):
+        study_row["id"] = study_id
+        _queue_child_rows(data, study_id, pending)
+    
+    # Parents go in immediately so queued child rows can reference them
+    session.execute(ClinicalStudy.__table__.insert(), [study_row for _, study_row in new_studies])
+
+def _copy_value(value):
+    """Convert a row value to its COPY CSV representation."""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value).decode()
+    return value
+
+def _copy_rows(cursor, model, rows, columns=None):
+    """
+    Stream rows into a table with COPY FROM STDIN.
+    
+    Args:
+        cursor: psycopg2 cursor
+        model: Model class of the target table
+        rows: List of row dictionaries
+        columns: Columns to load (defaults to every column except id)
+    """
+    table = model.__table__
+    if columns is None:
+        columns = [column.name for column in table.columns if column.name != "id"]
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row.get(column)) for column in columns])
+    buffer.seek(0)
+    
+    cursor.copy_expert(
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+        buffer
+    )
+
+def copy_json_data(json_dir, engine, max_workers=None):
+    """
+    Load all JSON files from a directory into freshly created tables using PostgreSQL COPY.
+    
+    Study IDs are assigned client-side so child rows can reference them
+    before anything reaches the database. The nct_identifier and contexts
+    indexes and the foreign keys are dropped for the load and recreated
+    afterwards. When the server runs with wal_level=minimal the tables are
+    also switched to UNLOGGED for the load; at higher WAL levels switching
+    them back would WAL-log a full rewrite, so they stay logged. Intended for
+    the full reload in main(); use load_json_data to add studies to
+    populated tables.
+    
+    Args:
+        json_dir: Directory containing JSON files
+        engine: SQLAlchemy engine
+        max_workers: Number of parsing processes (defaults to CPU count - 1)
+    """
+    studies = []
+    seen = set()
+    pending = {Endpoint: [], BaselineMeasure: [], SECFiling: [], Publication: []}
+    
+    for json_file, data in _parse_json_dir(json_dir, max_workers):
+        print(f"Processing {json_file}...")
+        
+        study_row = _study_row(data.get("clinical_study", {}))
+        nct_identifier = study_row["nct_identifier"]
+        if nct_identifier in seen:
+            print(f"Study {nct_identifier} already exists. Skipping.")
+            continue
+        seen.add(nct_identifier)
+        
+        study_row["id"] = len(studies) + 1
+        studies.append(study_row)
+        _queue_child_rows(data, study_row["id"], pending)
+    
+    if not studies:
+        print("No studies found to load.")
+        return
+    
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        
+        # Build the index and foreign keys once at the end instead of per row
+        for drop_sql, _ in DEFERRED_DDL:
+            cursor.execute(drop_sql)
+        
+        # Skip WAL while loading; if the load crashes the tables come back empty,
+        # which is fine for a full rebuild. SET LOGGED rewrites each table, and above
+        # wal_level=minimal that rewrite is itself WAL-logged in full, so the round trip
+        # would add a second copy of the data instead of saving one
+        cursor.execute("SHOW wal_level")
+        unlogged_tables = _storage_tables() if cursor.fetchone()[0] == "minimal" else []
+        for table in reversed(unlogged_tables):
+            cursor.execute(f"ALTER TABLE {table} SET UNLOGGED")
+        
+        study_columns = [column.name for column in ClinicalStudy.__table__.columns]
+        _copy_rows(cursor, ClinicalStudy, studies, study_columns)
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence('clinical_study', 'id'), %s)",
+            (len(studies),)
+        )
+        
+        for model, rows in pending.items():
+            if rows:
+                _copy_rows(cursor, model, rows)
+        
+        for table in unlogged_tables:
+            cursor.execute(f"ALTER TABLE {table} SET LOGGED")
+        
+        for _, create_sql in DEFERRED_DDL:
+            cursor.execute(create_sql)
+        
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+    
+    print("All data loaded successfully.")
+
+def _study_row(clinical_study_data):
+    """
+    Build the clinical_study column values from the clinical_study section of a JSON file.
+    
+    Args:
+        clinical_study_data: Clinical study section dictionary
+        
+    Returns:
+        Dictionary of column values
+    """
+    drug = clinical_study_data.get("interventional_drug") or {}
+    arms = clinical_study_data.get("study_arms") or {}
+    age_range = clinical_study_data.get("age_range")
+    if isinstance(age_range, (list, tuple)) and len(age_range) >= 2:
+        min_age, max_age = age_range[:2]
+    else:
+        min_age, max_age = 0, 0
+    
+    return {
+        "title": clinical_study_data.get("title"),
+        "nct_identifier": clinical_study_data.get("nct_identifier"),
+        "indication": clinical_study_data.get("indication"),
+        "intervention": clinical_study_data.get("intervention"),
         
         # Intervention details
-        interventional_drug_name=clinical_study_data.get("interventional_drug", {}).get("name"),
-        interventional_drug_dose=clinical_study_data.get("interventional_drug", {}).get("dose"),
-        interventional_drug_frequency=clinical_study_data.get("interventional_drug", {}).get("frequency"),
-        interventional_drug_formulation=clinical_study_data.get("interventional_drug", {}).get("formulation"),
+        "interventional_drug_name": drug.get("name"),
+        "interventional_drug_dose": drug.get("dose"),
+        "interventional_drug_frequency": drug.get("frequency"),
+        "interventional_drug_formulation": drug.get("formulation"),
         
         # Study arms
-        intervention_arms=clinical_study_data.get("study_arms", {}).get("intervention", 0),
-        placebo_arms=clinical_study_data.get("study_arms", {}).get("placebo", 0),
+        "intervention_arms": arms.get("intervention", 0),
+        "placebo_arms": arms.get("placebo", 0),
         
         # Participant information
-        number_of_participants=clinical_study_data.get("number_of_participants", 0),
-        average_age=clinical_study_data.get("average_age", 0),
-        min_age=clinical_study_data.get("age_range", [0, 0])[0] if isinstance(clinical_study_data.get("age_range"), list) else 0,
-        max_age=clinical_study_data.get("age_range", [0, 0])[1] if isinstance(clinical_study_data.get("age_range"), list) else 0,
+        "number_of_participants": clinical_study_data.get("number_of_participants", 0),
+        "average_age": clinical_study_data.get("average_age", 0),
+        "min_age": min_age,
+        "max_age": max_age,
         
         # Phase
-        phase=clinical_study_data.get("phase"),
+        "phase": clinical_study_data.get("phase"),
         
         # Sponsor
-        sponsor=clinical_study_data.get("sponsor")
-    )
+        "sponsor": clinical_study_data.get("sponsor")
+    }
+
+def _parse_date(value):
+    """
+    Parse a filing date into a date.
     
-    session.add(study)
-    session.flush()  # Get the ID for relationships
+    Accepts ISO dates and datetimes as well as year-only ("2020") and year-month ("2020-03")
+    values, which are taken as the first day of that period.
+    
+    Args:
+        value: Date string from the JSON record
+        
+    Returns:
+        Parsed date, or None if the value is missing or cannot be parsed
+    """
+    if not value:
+        return None
+    try:
+        text_value = str(value).strip()
+        if len(text_value) == 4:
+            return date(int(text_value), 1, 1)
+        if len(text_value) == 7:
+            return date(int(text_value[:4]), int(text_value[5:]), 1)
+        return date.fromisoformat(text_value[:10])
+    except ValueError:
+        print(f"Unrecognized date {value!r}, storing NULL.")
+        return None
+
+def _make_row(study_id, keys, source):
+    """
+    Build a child row from the fields of a JSON record that map one-to-one onto columns.
+    
+    Args:
+        study_id: ID of the parent clinical_study row
+        keys: Column names copied from the record
+        source: JSON record dictionary
+        
+    Returns:
+        Row dictionary with clinical_study_id and every key (None when missing)
+    """
+    row = {"clinical_study_id": study_id}
+    row.update(zip(keys, map(source.get, keys)))
+    return row
+
+def _queue_child_rows(data, study_id, pending):
+    """
+    Append the endpoint, baseline, SEC filing and publication rows of a study to the queue.
     
+    Args:
+        data: Clinical study data dictionary
+        study_id: ID of the parent clinical_study row
+        pending: Dictionary mapping model classes to lists of row dictionaries
+    """
     # Process endpoints
-    endpoints_data = data.get("endpoints", [])
-    for endpoint_data in endpoints_data:
-        endpoint = Endpoint(
-            clinical_study_id=study.id,
-            name=endpoint_data.get("name"),
-            description=endpoint_data.get("description"),
-            timepoint=endpoint_data.get("timepoint"),
-            arm=endpoint_data.get("arm"),
-            average_value=endpoint_data.get("average_value"),
-            upper_end=endpoint_data.get("upper_end"),
-            lower_end=endpoint_data.get("lower_end"),
-            statistical_significance=endpoint_data.get("statistical_significance")
-        )
-        session.add(endpoint)
+    pending[Endpoint].extend(
+        _make_row(study_id, ENDPOINT_KEYS, endpoint_data) for endpoint_data in data.get("endpoints", [])
+    )
     
     # Process baseline measures
-    baseline_data = data.get("baseline_measures", [])
-    for baseline_measure_data in baseline_data:
-        baseline_measure = BaselineMeasure(
-            clinical_study_id=study.id,
-            name=baseline_measure_data.get("name"),
-            description=baseline_measure_data.get("description"),
-            arm=baseline_measure_data.get("arm"),
-            average_value=baseline_measure_data.get("average_value"),
-            upper_end=baseline_measure_data.get("upper_end"),
-            lower_end=baseline_measure_data.get("lower_end")
-        )
-        session.add(baseline_measure)
+    pending[BaselineMeasure].extend(
+        _make_row(study_id, BASELINE_KEYS, baseline_measure_data)
+        for baseline_measure_data in data.get("baseline_measures", [])
+    )
     
     # Process SEC filings
     sec_filings_data = data.get("sec_filings", {})
     for form_type, filings in sec_filings_data.items():
         for filing_data in filings:
             try:
-                filing = SECFiling(
-                    clinical_study_id=study.id,
-                    cik=filing_data.get("cik"),
-                    accession_number=filing_data.get("accession_number"),
-                    filing_date=filing_data.get("filing_date"),
-                    form_type=filing_data.get("form", form_type),
-                    total_mentions=filing_data.get("total_mentions", 0),
-                    name_mentions=filing_data.get("name_mentions", 0),
-                    nct_mentions=filing_data.get("nct_mentions", 0),
-                    contexts=filing_data.get("contexts", [])
-                )
-                session.add(filing)
+                pending[SECFiling].append({
+                    "clinical_study_id": study_id,
+                    "cik": filing_data.get("cik"),
+                    "accession_number": filing_data.get("accession_number"),
+                    "filing_date": _parse_date(filing_data.get("filing_date")),
+                    "form_type": filing_data.get("form", form_type),
+                    "total_mentions": filing_data.get("total_mentions", 0),
+                    "name_mentions": filing_data.get("name_mentions", 0),
+                    "nct_mentions": filing_data.get("nct_mentions", 0),
+                    "contexts": filing_data.get("contexts", [])
+                })
             except Exception as e:
                 print(f"Error adding SEC filing: {e}")
                 print(f"Filing data: {filing_data}")
@@ -167,16 +467,17 @@ def process_clinical_study(data, session):
     # Scientific publications
     for pub_data in publications_data.get("scientific_publications", []):
         try:
-            publication = Publication(
-                clinical_study_id=study.id,
-                title=pub_data.get("title"),
-                link=pub_data.get("link"),
-                snippet=pub_data.get("snippet"),
-                source="scientific_publication",
-                authors=pub_data.get("authors"),
-                journal=pub_data.get("journal")
-            )
-            session.add(publication)
+            pending[Publication].append({
+                "clinical_study_id": study_id,
+                "title": pub_data.get("title"),
+                "link": pub_data.get("link"),
+                "snippet": pub_data.get("snippet"),
+                "source": "scientific_publication",
+                "authors": pub_data.get("authors"),
+                "journal": pub_data.get("journal"),
+                "local_path": None,
+                "text_sample": None
+            })
         except Exception as e:
             print(f"Error adding scientific publication: {e}")
             print(f"Publication data: {pub_data}")
@@ -184,16 +485,17 @@ def process_clinical_study(data, session):
     # Company presentations
     for pres_data in publications_data.get("company_presentations", []):
         try:
-            presentation = Publication(
-                clinical_study_id=study.id,
-                title=pres_data.get("title"),
-                link=pres_data.get("url", pres_data.get("link")),
-                snippet=pres_data.get("snippet"),
-                source="company_presentation",
-                local_path=pres_data.get("local_path"),
-                text_sample=pres_data.get("text_sample")
-            )
-            session.add(presentation)
+            pending[Publication].append({
+                "clinical_study_id": study_id,
+                "title": pres_data.get("title"),
+                "link": pres_data.get("url", pres_data.get("link")),
+                "snippet": pres_data.get("snippet"),
+                "source": "company_presentation",
+                "authors": None,
+                "journal": None,
+                "local_path": pres_data.get("local_path"),
+                "text_sample": pres_data.get("text_sample")
+            })
         except Exception as e:
             print(f"Error adding company presentation: {e}")
             print(f"Presentation data: {pres_data}")
@@ -203,6 +505,8 @@ def main():
     parser = argparse.ArgumentParser(description="Load clinical trial data into PostgreSQL")
     parser.add_argument("--json-dir", default=os.path.join(project_root, "data", "outputs", "json"),
                         help="Directory containing JSON files")
+    parser.add_argument("--insert", action="store_true",
+                        help="Load through Core executemany inserts instead of COPY")
     args = parser.parse_args()
     
     # Load database config
@@ -217,6 +521,11 @@ def main():
     # Create tables
     create_tables(engine)
     
+    # The tables are empty, so the whole directory can be streamed in with COPY
+    if not args.insert:
+        copy_json_data(args.json_dir, engine)
+        return
+    
     # Get database session
     session = get_session(engine)
     
@@ -2,7 +2,8 @@
 PostgreSQL database models for the Clinical Trial & Corporate Disclosure Extraction Pipeline.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, Boolean, Index, Date
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -54,8 +55,9 @@ class Endpoint(Base):
     
     __tablename__ = 'endpoints'
     
-    id = Column(Integer, primary_key=True)
-    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'))
+    # Hash-partitioned on clinical_study_id, which must therefore be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'), primary_key=True)
     
     name = Column(String(500))  # Increased from 200 to 500
     description = Column(Text)
@@ -70,6 +72,8 @@ class Endpoint(Base):
     # Relationship
     clinical_study = relationship("ClinicalStudy", back_populates="endpoints")
     
+    __table_args__ = {'postgresql_partition_by': 'HASH (clinical_study_id)'}
+    
     def __repr__(self):
         return f"<Endpoint(name='{self.name}', arm='{self.arm}')>"
 
@@ -79,8 +83,8 @@ class BaselineMeasure(Base):
     
     __tablename__ = 'baseline_measures'
     
-    id = Column(Integer, primary_key=True)
-    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'))
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'), primary_key=True)
     
     name = Column(String(500))  # Increased from 200 to 500
     description = Column(Text)
@@ -93,6 +97,8 @@ class BaselineMeasure(Base):
     # Relationship
     clinical_study = relationship("ClinicalStudy", back_populates="baseline_measures")
     
+    __table_args__ = {'postgresql_partition_by': 'HASH (clinical_study_id)'}
+    
     def __repr__(self):
         return f"<BaselineMeasure(name='{self.name}', arm='{self.arm}')>"
 
@@ -102,24 +108,29 @@ class SECFiling(Base):
     
     __tablename__ = 'sec_filings'
     
-    id = Column(Integer, primary_key=True)
-    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'))
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'), primary_key=True)
     
     cik = Column(String(20))
     accession_number = Column(String(100))  # Increased from 50 to 100
-    filing_date = Column(String(500))       # Increased from 20 to 500
+    filing_date = Column(Date)
     form_type = Column(String(20))          # Increased from 10 to 20
     
     total_mentions = Column(Integer)
     name_mentions = Column(Integer)
     nct_mentions = Column(Integer)
     
-    # Context excerpts as JSON
-    contexts = Column(JSON)
+    # Context excerpts as JSONB (GIN-indexed for containment queries)
+    contexts = Column(JSONB)
     
     # Relationship
     clinical_study = relationship("ClinicalStudy")
     
+    __table_args__ = (
+        Index('ix_sec_filings_contexts', contexts, postgresql_using='gin'),
+        {'postgresql_partition_by': 'HASH (clinical_study_id)'},
+    )
+    
     def __repr__(self):
         return f"<SECFiling(form_type='{self.form_type}', filing_date='{self.filing_date}')>"
 
@@ -129,8 +140,8 @@ class Publication(Base):
     
     __tablename__ = 'publications'
     
-    id = Column(Integer, primary_key=True)
-    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'))
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    clinical_study_id = Column(Integer, ForeignKey('clinical_study.id'), primary_key=True)
     
     title = Column(String(1000))  # Increased from 500 to 1000
     link = Column(String(2000))   # Increased from 1000 to 2000
@@ -146,5 +157,7 @@ class Publication(Base):
     # Relationship
     clinical_study = relationship("ClinicalStudy")
     
+    __table_args__ = {'postgresql_partition_by': 'HASH (clinical_study_id)'}
+    
     def __repr__(self):
         return f"<Publication(title='{self.title}', source='{self.source}')>"
\ No newline at end of file
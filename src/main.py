@@ -4,9 +4,10 @@ Using Financial Modeling Prep API for SEC data.
 """
 
 import os
-import json
 import sys
 import re
+import orjson
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -35,24 +36,30 @@ COMPANY_DOMAINS = {
     "Bayer": "bayer.com"
 }
 
+# Lowercased once so lookups only lowercase the sponsor name
+_COMPANY_DOMAINS_LC = tuple((company.lower(), domain) for company, domain in COMPANY_DOMAINS.items())
+_NON_WORD_RE = re.compile(r'[^\w]')
+
+@lru_cache(maxsize=256)
 def get_company_domain(sponsor_name):
     """Get the company website domain for a sponsor."""
-    for company, domain in COMPANY_DOMAINS.items():
-        if company.lower() in sponsor_name.lower():
+    sponsor_lower = sponsor_name.lower()
+    for company, domain in _COMPANY_DOMAINS_LC:
+        if company in sponsor_lower:
             return domain
     
     # Default to company name + .com
-    simplified_name = sponsor_name.split(',')[0].split('(')[0].strip().lower()
-    simplified_name = re.sub(r'[^\w]', '', simplified_name)
+    simplified_name = sponsor_lower.split(',')[0].split('(')[0].strip()
+    simplified_name = _NON_WORD_RE.sub('', simplified_name)
     return f"{simplified_name}.com"
 
 def load_config():
     """Load configuration from config file."""
     config_path = os.path.join(project_root, "config", "config.json")
     try:
-        with open(config_path, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open(config_path, "rb") as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
         print(f"Warning: Could not load config from {config_path}. Using default values.")
         return {
             "clinicaltrials": {
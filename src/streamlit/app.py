@@ -4,18 +4,24 @@ Streamlit frontend for Clinical Trials Pipeline.
 
 import os
 import sys
-import json
+import re
+import hashlib
+import threading
+import orjson
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from PIL import Image
-import time
-import altair as alt
-from io import BytesIO
-import base64
-import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+try:
+    import ijson  # Optional: reads trial summaries without parsing whole files
+except ImportError:
+    ijson = None
 
 # Add project root to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,9 +29,67 @@ src_dir = os.path.dirname(current_dir)
 project_root = os.path.dirname(src_dir)
 sys.path.append(project_root)
 
+from src.data_processors.endpoint_processor import is_significant_p_value
+
 # Set API URL (change if deployed elsewhere)
 API_URL = "http://localhost:8000"
 
+# Function to create the keep-alive API session once per server process; the script reruns in a
+# fresh namespace, so a module-level session would be rebuilt (and its pool leaked) on every rerun
+@st.cache_resource
+def api_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Common endpoints for PAH trials, offered on the Endpoint Comparison page (read-only)
+ENDPOINT_OPTIONS = MappingProxyType({
+    "PVR": "Pulmonary Vascular Resistance",
+    "6MWD": "6-Minute Walk Distance",
+    "NT-proBNP": "NT-proBNP Levels", 
+    "WHO FC": "WHO Functional Class", 
+    "CARDIAC OUTPUT": "Cardiac Output"
+})
+
+# Descriptions shown above the comparison for each common endpoint (read-only)
+ENDPOINT_DESCRIPTIONS = MappingProxyType({
+    "PVR": "Pulmonary Vascular Resistance (PVR) measures the resistance to blood flow through the pulmonary circulation. A decrease indicates improved blood flow.",
+    "6MWD": "6-Minute Walk Distance (6MWD) measures the distance a patient can walk in 6 minutes, indicating exercise capacity and functional status.",
+    "NT-proBNP": "N-terminal pro-brain natriuretic peptide (NT-proBNP) is a biomarker of heart failure and right ventricular dysfunction. Lower values indicate improved heart function.",
+    "WHO FC": "WHO Functional Class (WHO FC) classifies the severity of symptoms and functional limitations in patients with pulmonary hypertension.",
+    "CARDIAC OUTPUT": "Cardiac Output measures the volume of blood pumped by the heart per minute, reflecting heart function."
+})
+
+# Table column labels, built once instead of on every rerun
+TRIALS_COLUMN_CONFIG = {
+    "nct_identifier": "NCT ID",
+    "title": "Trial Title",
+    "sponsor": "Sponsor",
+    "phase": "Phase",
+    "indication": "Indication",
+    "number_of_participants": "Participants"
+}
+ENDPOINTS_COLUMN_CONFIG = {
+    "name": "Endpoint",
+    "arm": "Treatment Arm",
+    "timepoint": "Timepoint",
+    "average_value": "Value",
+    "statistical_significance": "P-value",
+    "description": None  # Hide description column
+}
+BASELINE_COLUMN_CONFIG = {
+    "name": "Baseline Measure",
+    "arm": "Treatment Arm",
+    "average_value": "Value",
+    "description": None  # Hide description column
+}
+
+# Shared Plotly layout settings
+CHART_FONT = dict(family="Arial", size=12)
+CHART_TITLE_LAYOUT = dict(title_font_size=18, font=CHART_FONT, title_font_family="Arial", title_x=0.5)
+
 # ---- THEME CONFIGURATION ----
 # Set Streamlit theme
 st.set_page_config(
@@ -36,7 +100,7 @@ st.set_page_config(
 )
 
 # Custom CSS for more professional look
-st.markdown("""
+APP_CSS = """
 <style>
     /* Main header styling */
     .main-header {
@@ -86,14 +150,6 @@ st.markdown("""
         color: #1E88E5;
     }
     
-    /* Data table styling */
-    .dataframe-container {
-        padding: 0.5rem;
-        border-radius: 0.5rem;
-        background-color: #ffffff;
-        box-shadow: 0 0.15rem 0.5rem rgba(0, 0, 0, 0.05);
-    }
-    
     /* Status indicators */
     .status-success {
         color: #4CAF50;
@@ -129,6 +185,17 @@ st.markdown("""
         background-color: #1565C0;
     }
     
+    /* Side-by-side cards */
+    .card-row {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 1.5rem;
+    }
+    
+    .card-row > .card {
+        flex: 1 1 18rem;
+    }
+    
     /* Footer styling */
     .footer {
         text-align: center;
@@ -139,169 +206,782 @@ st.markdown("""
         font-size: 0.8rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Function to strip comments and collapse whitespace in the CSS once per process,
+# keeping the stylesheet sent on every rerun small
+@st.cache_resource
+def minified_css():
+    css = re.sub(r"/\*.*?\*/", "", APP_CSS, flags=re.S)
+    return re.sub(r"\s+", " ", css).strip()
+
+st.html(minified_css())
 
 # ---- HELPER FUNCTIONS ----
 
+# Function to import Plotly on first use, so sessions that never draw a chart skip loading it
+@lru_cache(maxsize=1)
+def _plotly():
+    import plotly.express as px
+    import plotly.graph_objects as go
+    return px, go
+
 # Function to create a base64 encoded string for download links
 def get_download_link(df, filename, text):
+    import base64
+    
     csv = df.to_csv(index=False)
     b64 = base64.b64encode(csv.encode()).decode()
     href = f'<a href="data:file/csv;base64,{b64}" download="{filename}" class="custom-button">{text}</a>'
     return href
 
-# Function for animated progress tracking
-def progress_tracker(task_name):
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    for i in range(101):
-        progress_bar.progress(i)
-        if i < 70:
-            status_text.text(f"{task_name}... ({i}%)")
-        elif i < 90:
-            status_text.text(f"{task_name}... Processing data ({i}%)")
-        else:
-            status_text.text(f"{task_name}... Finalizing ({i}%)")
-        time.sleep(0.01)
-    status_text.empty()
-    progress_bar.empty()
+# Function to serialize a DataFrame to CSV bytes, recomputed only when the frame's contents change
+@st.cache_data(max_entries=32, show_spinner=False)
+def df_to_csv(df):
+    return df.to_csv(index=False).encode('utf-8')
 
-# Function to load trials with robust error handling
-@st.cache_data
-def load_trials():
-    with st.spinner("Loading clinical trial data..."):
+# Function to GET an API path as JSON
+def _get_json(path, params=None, timeout=10, session=None):
+    response = (session or api_session()).get(f"{API_URL}{path}", params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+# Function to GET several API paths concurrently
+def _parallel_get(paths, params=None, timeout=10):
+    # Look the cached session up here; the pool threads have no script context to do it
+    session = api_session()
+    
+    def fetch(path):
         try:
-            # First check if API is available
-            try:
-                health_response = requests.get(f"{API_URL}/health", timeout=5)
-                health_response.raise_for_status()
-                st.success(f"✅ API connected successfully: {health_response.json().get('status', 'healthy')}")
-            except:
-                st.warning("⚠️ API health check failed - using fallback data")
-            
-            # Try to get trial data
-            response = requests.get(f"{API_URL}/trials", timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.ConnectionError:
-            st.error(f"❌ Cannot connect to API at {API_URL}. Make sure the FastAPI server is running.")
-            return load_fallback_trials()
-        except requests.exceptions.HTTPError as e:
-            st.error(f"❌ HTTP error: {e}")
-            return load_fallback_trials()
+            return _get_json(path, params=params, timeout=timeout, session=session)
         except Exception as e:
-            st.error(f"❌ Error loading trials: {str(e)}")
-            return load_fallback_trials()
+            return e
+    
+    # Each result is either the parsed JSON or the exception the request raised
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(executor.map(fetch, paths))
+
+# Function to unwrap a _parallel_get result, raising any request or HTTP error
+def _json_or_raise(result):
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+# Function to classify p-values as significant with the pipeline's rule, so the dashboard and the
+# generated reports mark the same trials; takes a single value or a Series (returning a boolean Series)
+def is_significant(p_value):
+    if isinstance(p_value, pd.Series):
+        return p_value.map(is_significant_p_value).astype(bool)
+    return is_significant_p_value(p_value)
+
+# Function to build asymmetric error bars for a measured value, or None when it has no bounds
+def error_bars(point):
+    value, upper, lower = point["average_value"], point["upper_end"], point["lower_end"]
+    if upper is None and lower is None:
+        return None
+    return dict(
+        type='data',
+        symmetric=False,
+        array=[upper - value if upper is not None else 0],
+        arrayminus=[value - lower if lower is not None else 0]
+    )
+
+# Function to turn one arm's measured value into a px.bar row; error extents match error_bars, NaN when absent
+def bar_record(arm, point):
+    bars = error_bars(point)
+    return dict(
+        arm=arm,
+        value=point["average_value"],
+        label=f"{point['average_value']}",
+        err_up=bars["array"][0] if bars else float("nan"),
+        err_lo=bars["arrayminus"][0] if bars else float("nan")
+    )
+
+# Function to parse a JSON file once per modification time; st.cache_data keeps the result
+# across reruns, which an lru_cache in this re-executed script would not
+@st.cache_data(max_entries=256, show_spinner=False)
+def _load_json(path, mtime):
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+# Function to read several JSON files on a thread pool so the disk reads overlap; the workers
+# get the caller's script context so their _load_json cache lookups run as part of this run
+def _load_json_files(paths):
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(paths))),
+                            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)) as executor:
+        return list(executor.map(lambda path: _load_json(path, os.path.getmtime(path)), paths))
+
+# Scalar clinical_study fields shown in the trials overview
+SUMMARY_FIELDS = ("title", "nct_identifier", "indication", "intervention", "phase",
+                  "sponsor", "number_of_participants", "average_age")
+
+# Function to read only the summary fields of a trial, stopping once they have all been seen;
+# cached per (path, mtime) with st.cache_data so the result outlives the rerun
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _load_study_summary(path, mtime):
+    if ijson is None:
+        study_info = _load_json(path, mtime).get("clinical_study", {})
+        return {k: study_info[k] for k in SUMMARY_FIELDS if k in study_info}
+    
+    study_info = {}
+    with open(path, 'rb') as f:
+        for k, v in ijson.kvitems(f, 'clinical_study', use_float=True):
+            if k in SUMMARY_FIELDS:
+                study_info[k] = v
+                if len(study_info) == len(SUMMARY_FIELDS):
+                    break
+    return study_info
+
+# Function to list the NCT JSON files in a directory, rescanned at most once a minute
+@st.cache_data(ttl=60)
+def _list_nct_files(json_dir):
+    return [f for f in os.listdir(json_dir) if f.endswith('.json') and f.startswith('NCT')]
+
+# Function to parse every NCT JSON file once per process, shared by all sessions (callers must not mutate it)
+@st.cache_resource(ttl=60, show_spinner=False)
+def _all_nct(json_dir):
+    json_files = _list_nct_files(json_dir)
+    paths = [os.path.join(json_dir, json_file) for json_file in json_files]
+    return dict(zip((json_file[:-len('.json')] for json_file in json_files), _load_json_files(paths)))
+
+# Function to render the (kind, message) notices returned by the cached loaders
+def show_notices(notices):
+    for kind, message in notices:
+        getattr(st, kind)(message)
+
+# Function to load trials with robust error handling; returns (trials, notices)
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def load_trials():
+    notices = []
+    try:
+        # Check the API and fetch the trials at the same time
+        health_result, trials_result = _parallel_get(["/health", "/trials"])
+        try:
+            health = _json_or_raise(health_result)
+            notices.append(("success", f"✅ API connected successfully: {health.get('status', 'healthy')}"))
+        except:
+            notices.append(("warning", "⚠️ API health check failed - using fallback data"))
+        
+        # Try to get trial data
+        return _json_or_raise(trials_result), notices
+    except requests.exceptions.ConnectionError:
+        notices.append(("error", f"❌ Cannot connect to API at {API_URL}. Make sure the FastAPI server is running."))
+        return load_fallback_trials(notices), notices
+    except requests.exceptions.HTTPError as e:
+        notices.append(("error", f"❌ HTTP error: {e}"))
+        return load_fallback_trials(notices), notices
+    except Exception as e:
+        notices.append(("error", f"❌ Error loading trials: {str(e)}"))
+        return load_fallback_trials(notices), notices
 
 # Fallback function to load trial data from JSON files
-def load_fallback_trials():
-    st.info("ℹ️ Loading data directly from JSON files...")
+def load_fallback_trials(notices):
+    notices.append(("info", "ℹ️ Loading data directly from JSON files..."))
     try:
         json_dir = os.path.join(project_root, "data", "outputs", "json")
         trials = []
         
-        # Get NCT files
-        json_files = [f for f in os.listdir(json_dir) if f.endswith('.json') and f.startswith('NCT')]
-        
-        progress_tracker("Reading JSON files")
-        
         # Extract basic trial info from each file
-        for json_file in json_files[:10]:  # Limit to 10 for performance
+        for json_file in _list_nct_files(json_dir):
             file_path = os.path.join(json_dir, json_file)
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                study_info = data.get("clinical_study", {})
-                
-                trials.append({
-                    "id": len(trials) + 1,
-                    "title": study_info.get("title", "Unknown"),
-                    "nct_identifier": study_info.get("nct_identifier", "Unknown"),
-                    "indication": study_info.get("indication", "Unknown"),
-                    "intervention": study_info.get("intervention", "Unknown"),
-                    "phase": study_info.get("phase", "Unknown"),
-                    "sponsor": study_info.get("sponsor", "Unknown"),
-                    "number_of_participants": study_info.get("number_of_participants", 0),
-                    "average_age": study_info.get("average_age", 0)
-                })
+            study_info = _load_study_summary(file_path, os.path.getmtime(file_path))
+            
+            trials.append({
+                "id": len(trials) + 1,
+                "title": study_info.get("title", "Unknown"),
+                "nct_identifier": study_info.get("nct_identifier", "Unknown"),
+                "indication": study_info.get("indication", "Unknown"),
+                "intervention": study_info.get("intervention", "Unknown"),
+                "phase": study_info.get("phase", "Unknown"),
+                "sponsor": study_info.get("sponsor", "Unknown"),
+                "number_of_participants": study_info.get("number_of_participants", 0),
+                "average_age": study_info.get("average_age", 0)
+            })
         
         return trials
     except Exception as e:
-        st.error(f"❌ Failed to load fallback data: {str(e)}")
+        notices.append(("error", f"❌ Failed to load fallback data: {str(e)}"))
         return []
 
-# Function to load specific trial with fallback
-@st.cache_data
+# Function to load specific trial with fallback; returns (trial data, notices)
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
 def load_trial(nct_id):
-    with st.spinner(f"Loading details for trial {nct_id}..."):
+    notices = []
+    try:
+        return _get_json(f"/trials/{nct_id}"), notices
+    except Exception as e:
+        notices.append(("warning", f"⚠️ API error: {str(e)}. Loading from JSON file."))
         try:
-            response = requests.get(f"{API_URL}/trials/{nct_id}", timeout=10)
-            response.raise_for_status()
-            return response.json()
+            # Try loading from JSON
+            json_path = os.path.join(project_root, "data", "outputs", "json", f"{nct_id}.json")
+            return _load_json(json_path, os.path.getmtime(json_path)), notices
+        except Exception as file_e:
+            notices.append(("error", f"❌ Failed to load trial data: {str(file_e)}"))
+            return None, notices
+
+# Function to tabulate one section ("endpoints" or "baseline_measures") of a trial, once per trial
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def trial_table(nct_id, section):
+    trial_data, _ = load_trial(nct_id)
+    table = pd.DataFrame(trial_data[section])
+    
+    # Arm has two values, so a categorical serializes to Arrow as a small dictionary
+    if "arm" in table.columns:
+        table["arm"] = table["arm"].astype("category")
+    return table
+
+# Function to pair each endpoint's arms and prepare its chart inputs, once per trial; keyed by endpoint name
+# and limited to endpoints with values in both arms
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def endpoint_chart_inputs(nct_id):
+    trial_data, _ = load_trial(nct_id)
+    
+    # Group by name and arm
+    endpoint_groups = {}
+    for endpoint in trial_data["endpoints"]:
+        name = endpoint["name"]
+        if name not in endpoint_groups:
+            endpoint_groups[name] = {"intervention": None, "placebo": None}
+        
+        if endpoint["arm"] == "intervention":
+            endpoint_groups[name]["intervention"] = endpoint
+        elif endpoint["arm"] == "placebo":
+            endpoint_groups[name]["placebo"] = endpoint
+    
+    # Prepare chart inputs in one pass for endpoints with values in both arms
+    prepped = {}
+    for name, data in endpoint_groups.items():
+        intervention, placebo = data["intervention"], data["placebo"]
+        if not (intervention and placebo and
+                intervention["average_value"] is not None and
+                placebo["average_value"] is not None):
+            continue
+        
+        p_value = intervention["statistical_significance"]
+        significant = bool(p_value) and is_significant(p_value)
+        prepped[name] = {
+            "int_y": intervention["average_value"],
+            "pla_y": placebo["average_value"],
+            "bars": [bar_record("Intervention", intervention), bar_record("Placebo", placebo)],
+            "p_value": p_value,
+            "significant": significant,
+            "p_color": "#4CAF50" if significant else "#F44336"
+        }
+    
+    return prepped
+
+# Function to fetch several endpoint comparisons from the API in parallel
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def prefetch_endpoints(endpoint_names, include_placebo=True):
+    results = _parallel_get([f"/endpoints/{name}" for name in endpoint_names],
+                            params={"include_placebo": include_placebo})
+    
+    # Map each name to (data, error message) so failures can fall back individually
+    fetched = {}
+    for name, result in zip(endpoint_names, results):
+        try:
+            fetched[name] = (_json_or_raise(result), None)
         except Exception as e:
-            st.warning(f"⚠️ API error: {str(e)}. Loading from JSON file.")
-            try:
-                # Try loading from JSON
-                json_path = os.path.join(project_root, "data", "outputs", "json", f"{nct_id}.json")
-                with open(json_path, 'r') as f:
-                    return json.load(f)
-            except Exception as file_e:
-                st.error(f"❌ Failed to load trial data: {str(file_e)}")
-                return None
-
-# Function to compare endpoints with fallback
-@st.cache_data
+            fetched[name] = (None, str(e))
+    return fetched
+
+# Function to flatten the endpoints of every JSON file into one table
+@st.cache_data(ttl=60, show_spinner=False)
+def _all_endpoints_df(json_dir):
+    rows = []
+    for data in _all_nct(json_dir).values():
+        study_info = data.get("clinical_study", {})
+        nct_id = study_info.get("nct_identifier", "")
+        title = study_info.get("title", "")
+        sponsor = study_info.get("sponsor", "")
+        
+        for endpoint in data.get("endpoints", []):
+            rows.append({
+                "nct_id": nct_id,
+                "study_title": title,
+                "sponsor": sponsor,
+                "endpoint_name": endpoint.get("name", ""),
+                "arm": endpoint.get("arm", ""),
+                "timepoint": endpoint.get("timepoint", ""),
+                "value": endpoint.get("average_value"),
+                "upper_end": endpoint.get("upper_end"),
+                "lower_end": endpoint.get("lower_end"),
+                "p_value": endpoint.get("statistical_significance", "")
+            })
+    
+    return pd.DataFrame(rows, columns=["nct_id", "study_title", "sponsor", "endpoint_name", "arm", "timepoint",
+                                       "value", "upper_end", "lower_end", "p_value"])
+
+# Column dtypes for endpoint comparisons; categoricals and Arrow strings serialize compactly to st.dataframe
+COMPARISON_DTYPES = {"nct_id": "string[pyarrow]", "sponsor": "category", "arm": "category"}
+
+# Function to apply COMPARISON_DTYPES to whichever of those columns a comparison has
+def _typed_comparison(df):
+    return df.astype({col: dtype for col, dtype in COMPARISON_DTYPES.items() if col in df.columns})
+
+# Function to compare endpoints with fallback; returns (endpoint DataFrame, notices)
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
 def compare_endpoint(endpoint_name, include_placebo=True):
-    with st.spinner(f"Analyzing {endpoint_name} across trials..."):
+    notices = []
+    try:
+        # The common endpoints are fetched together on first use
+        names = tuple(ENDPOINT_OPTIONS) if endpoint_name in ENDPOINT_OPTIONS else (endpoint_name,)
+        data, error = prefetch_endpoints(names, include_placebo)[endpoint_name]
+        if error is not None:
+            raise Exception(error)
+        return _typed_comparison(pd.DataFrame(data)), notices
+    except Exception as e:
+        notices.append(("warning", f"⚠️ API error: {str(e)}. Loading endpoint data from JSON files."))
         try:
-            response = requests.get(
-                f"{API_URL}/endpoints/{endpoint_name}",
-                params={"include_placebo": include_placebo},
-                timeout=10
+            # Filter the flattened endpoint table from the JSON files
+            json_dir = os.path.join(project_root, "data", "outputs", "json")
+            df = _all_endpoints_df(json_dir)
+            
+            mask = df["endpoint_name"].str.contains(endpoint_name, case=False, regex=False, na=False)
+            # Skip if placebo not included
+            if not include_placebo:
+                mask &= df["arm"] != "placebo"
+            return _typed_comparison(df[mask].reset_index(drop=True)), notices
+        except Exception as file_e:
+            notices.append(("error", f"❌ Failed to load endpoint data: {str(file_e)}"))
+            return pd.DataFrame(), notices
+
+# ---- CACHED FIGURES ----
+# Figures are built from plain records and cached as JSON so reruns that don't change their inputs skip the rebuild.
+# Charts whose data follows a selectbox set a fixed uirevision and are drawn under a stable key, so Plotly
+# updates the existing plot in place and keeps the user's zoom and legend state.
+
+# Function to build the trials-by-sponsor bar chart
+@st.cache_data(max_entries=64, show_spinner=False)
+def sponsor_bar_json(sponsor_records):
+    px, go = _plotly()
+    # Improved bar chart
+    fig = px.bar(
+        pd.DataFrame(sponsor_records),
+        x="Count",
+        y="Sponsor",
+        title="Trials by Sponsor",
+        color="Count",
+        color_continuous_scale="Blues",
+        orientation='h'
+    )
+    
+    fig.update_layout(
+        height=400,
+        yaxis_title="",
+        xaxis_title="Number of Trials",
+        coloraxis_showscale=False,
+        **CHART_TITLE_LAYOUT,
+        margin=dict(l=20, r=20, t=50, b=20),
+        plot_bgcolor='white'
+    )
+    
+    return fig.to_json()
+
+# Function to build the phase distribution pie chart
+@st.cache_data(max_entries=64, show_spinner=False)
+def phase_pie_json(phase_records):
+    px, go = _plotly()
+    # Custom color sequence
+    color_sequence = ['#1f77b4', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22']
+    
+    fig = px.pie(
+        pd.DataFrame(phase_records),
+        names="Phase",
+        values="Count",
+        title="Trial Phase Distribution",
+        color_discrete_sequence=color_sequence,
+        hole=0.4
+    )
+    
+    fig.update_layout(
+        height=400,
+        legend_title="",
+        **CHART_TITLE_LAYOUT,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    
+    # Add percentage labels
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    
+    return fig.to_json()
+
+# Function to build the participants-by-trial bar chart
+@st.cache_data(max_entries=64, show_spinner=False)
+def participants_bar_json(participant_records):
+    px, go = _plotly()
+    df_participants = pd.DataFrame(participant_records)
+    
+    # Create bar chart with enhanced styling
+    fig = px.bar(
+        df_participants,
+        x="nct_identifier",
+        y="number_of_participants",
+        title=f"Number of Participants by Trial (Top {len(df_participants)})",
+        color="number_of_participants",
+        color_continuous_scale="Viridis",
+        labels={"nct_identifier": "Trial ID", "number_of_participants": "Number of Participants"}
+    )
+    
+    # Add trial titles as hover text
+    fig.update_traces(
+        hovertemplate="<b>%{x}</b><br>" +
+                     "Trial: %{customdata}<br>" +
+                     "Participants: %{y}<extra></extra>",
+        customdata=df_participants["title"].tolist()
+    )
+    
+    fig.update_layout(
+        height=500,
+        xaxis_title="Clinical Trial",
+        yaxis_title="Number of Participants",
+        coloraxis_showscale=False,
+        **CHART_TITLE_LAYOUT,
+        xaxis_tickangle=-45,
+        margin=dict(l=20, r=20, t=50, b=100),
+        plot_bgcolor='white'
+    )
+    
+    return fig.to_json()
+
+# Function to build the trial size bar for Trial Details
+@st.cache_data(max_entries=64, show_spinner=False)
+def trial_size_bar_json(number_of_participants):
+    px, go = _plotly()
+    labels = ["Participants"]
+    values = [number_of_participants]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=labels,
+        y=values,
+        marker_color='#1E88E5',
+        text=values,
+        textposition='auto',
+        width=0.5
+    ))
+    
+    fig.update_layout(
+        title="Trial Size",
+        height=200,
+        margin=dict(l=20, r=20, t=40, b=20),
+        yaxis_title="Count",
+        xaxis_title="",
+        showlegend=False,
+        plot_bgcolor='white'
+    )
+    
+    return fig.to_json()
+
+# Function to build the arms distribution pie for Trial Details
+@st.cache_data(max_entries=64, show_spinner=False)
+def arms_pie_json(intervention_arms, placebo_arms):
+    px, go = _plotly()
+    arms_data = {
+        "Arm Type": ["Intervention", "Placebo"],
+        "Count": [intervention_arms, placebo_arms]
+    }
+    arms_df = pd.DataFrame(arms_data)
+    
+    fig = px.pie(
+        arms_df,
+        names="Arm Type",
+        values="Count",
+        color_discrete_sequence=['#1976D2', '#90CAF9'],
+        hole=0.4
+    )
+    
+    fig.update_layout(
+        title="Arms Distribution",
+        height=200,
+        margin=dict(l=20, r=20, t=40, b=0),
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5)
+    )
+    
+    return fig.to_json()
+
+# Function to fingerprint a frame's contents with pandas' vectorized row hash, which is much
+# cheaper than Streamlit pickling and hashing the whole frame for a cache key; digesting the
+# row hashes in order keeps reordered or offsetting rows from colliding the way a sum would
+def frame_key(df):
+    return hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+
+# Function to build the endpoint comparison bar chart across trials
+# The cache is keyed on the endpoint, the placebo flag and the frame's fingerprint; the
+# underscore-prefixed frame itself is not hashed by Streamlit
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def endpoint_bar_json(endpoint_name, include_placebo, data_key, _df_plot):
+    df_plot = _df_plot
+    px, go = _plotly()
+    fig = px.bar(
+        df_plot,
+        x="nct_id",
+        y="value",
+        color="arm",
+        barmode="group",
+        color_discrete_map={"intervention": "#1976D2", "placebo": "#90CAF9"},
+        error_y="upper_end" if "upper_end" in df_plot.columns and not df_plot["upper_end"].isna().all() else None,
+        error_y_minus="lower_end" if "lower_end" in df_plot.columns and not df_plot["lower_end"].isna().all() else None,
+        labels={
+            "nct_id": "Clinical Trial",
+            "value": f"{endpoint_name} Value",
+            "arm": "Treatment Arm"
+        },
+        title=f"Comparison of {endpoint_name} Across PAH Clinical Trials",
+        hover_data=["study_title", "sponsor", "timepoint", "p_value"]
+    )
+    
+    # Customize layout
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        legend_title="Treatment Arm",
+        height=500,
+        uirevision="endpoint-compare",
+        font=CHART_FONT,
+        plot_bgcolor='white',
+        margin=dict(l=20, r=20, t=50, b=80)
+    )
+    
+    return fig.to_json()
+
+# Function to build the treatment effect chart across trials (keyed like endpoint_bar_json)
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def effect_bar_json(endpoint_name, data_key, _df_effects):
+    df_effects = _df_effects
+    px, go = _plotly()
+    # Create enhanced horizontal bar chart
+    fig = px.bar(
+        df_effects,
+        y="nct_id",
+        x="effect",
+        orientation="h",
+        color="is_significant",
+        color_discrete_map={True: "#4CAF50", False: "#F44336"},
+        labels={
+            "nct_id": "Clinical Trial",
+            "effect": f"Effect Size (Intervention - Placebo)",
+            "is_significant": "Statistically Significant"
+        },
+        title=f"Treatment Effect for {endpoint_name} Across PAH Clinical Trials",
+        hover_data=["study_title", "sponsor", "p_value", "intervention_value", "placebo_value"]
+    )
+    
+    # Improve the visualization
+    fig.update_layout(
+        height=500,
+        uirevision="endpoint-effect",
+        font=CHART_FONT,
+        plot_bgcolor='white',
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    
+    # Add vertical line at x=0
+    fig.add_shape(
+        type="line",
+        x0=0, y0=-0.5,
+        x1=0, y1=len(df_effects) - 0.5,
+        line=dict(color="gray", width=2, dash="dash")
+    )
+    
+    # Add p-values as one text trace beside the bars
+    fig.add_trace(go.Scatter(
+        x=df_effects["effect"] + np.where(df_effects["effect"] >= 0, 0.1, -0.1),
+        y=df_effects["nct_id"],
+        mode="text",
+        text=df_effects["p_value"].astype(str),
+        textfont=dict(size=10, color=np.where(df_effects["is_significant"], "#4CAF50", "#F44336")),
+        showlegend=False,
+        hoverinfo="skip"
+    ))
+    
+    return fig.to_json()
+
+# ---- TRIAL DETAIL TABS ----
+# Each tab is a fragment, so its selectbox reruns only that tab instead of the whole page
+
+# Function to render the endpoints table and arm comparison chart for a trial
+@st.fragment
+def render_endpoint_tab(trial_data):
+    px, go = _plotly()
+    if trial_data["endpoints"]:
+        endpoints_df = trial_table(trial_data["clinical_study"]["nct_identifier"], "endpoints")
+        
+        # Display endpoints table with improved styling
+        with st.container(border=True):
+            st.dataframe(
+                endpoints_df,
+                use_container_width=True,
+                column_config=ENDPOINTS_COLUMN_CONFIG
             )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            st.warning(f"⚠️ API error: {str(e)}. Loading endpoint data from JSON files.")
-            try:
-                progress_tracker("Extracting endpoint data")
-                # Load from JSON files
-                json_dir = os.path.join(project_root, "data", "outputs", "json")
-                json_files = [f for f in os.listdir(json_dir) if f.endswith('.json') and f.startswith('NCT')]
+        
+        # Create endpoint visualization
+        st.markdown("<h3>Endpoint Visualization</h3>", unsafe_allow_html=True)
+        
+        # Chart inputs are prepared once per trial by the cached loader
+        prepped = endpoint_chart_inputs(trial_data["clinical_study"]["nct_identifier"])
+        valid_endpoints = list(prepped)
+        
+        if valid_endpoints:
+            selected_endpoint = st.selectbox(
+                "Select endpoint to visualize",
+                valid_endpoints,
+                key="endpoint_select"
+            )
+            
+            if selected_endpoint:
+                endpoint_data = prepped[selected_endpoint]
+                int_value = endpoint_data["int_y"]
+                pla_value = endpoint_data["pla_y"]
                 
-                endpoint_data = []
-                for json_file in json_files:
-                    file_path = os.path.join(json_dir, json_file)
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
+                # Create comparison bar chart with improved styling, one bar per arm
+                fig = px.bar(
+                    pd.DataFrame(endpoint_data["bars"]),
+                    x="arm",
+                    y="value",
+                    color="arm",
+                    color_discrete_map={"Intervention": '#1976D2', "Placebo": '#90CAF9'},
+                    error_y="err_up",
+                    error_y_minus="err_lo",
+                    text="label"
+                )
+                fig.update_traces(textposition="outside")
+                
+                # Calculate difference for treatment effect
+                diff = int_value - pla_value
+                
+                # Update layout with improved styling
+                fig.update_layout(
+                    title=f"{selected_endpoint} Comparison",
+                    xaxis_title="Arm",
+                    yaxis_title=f"{selected_endpoint} Value",
+                    barmode='group',
+                    legend_title="",
+                    height=450,
+                    uirevision="trial-endpoint",
+                    plot_bgcolor='white',
+                    font=CHART_FONT,
+                    shapes=[
+                        # Line connecting bars for effect visualization
+                        dict(
+                            type='line',
+                            x0=0, y0=int_value,
+                            x1=1, y1=pla_value,
+                            line=dict(color='#616161', width=1, dash='dot')
+                        )
+                    ]
+                )
+                
+                # Add p-value annotation
+                p_value = endpoint_data["p_value"]
+                effect_text = f"Effect: {diff:.2f}"
+                
+                if p_value:
+                    fig.add_annotation(
+                        x=0.5,
+                        y=max(int_value, pla_value) * 1.1,
+                        text=f"{effect_text} | {p_value}",
+                        showarrow=False,
+                        font=dict(color=endpoint_data["p_color"], size=14)
+                    )
+                
+                st.plotly_chart(fig, use_container_width=True, key="trial_endpoint_fig")
+                
+                # Add p-value interpretation
+                if p_value:
+                    if endpoint_data["significant"]:
+                        st.success("✅ This endpoint shows a statistically significant difference between intervention and placebo.")
+                    else:
+                        st.info("ℹ️ This endpoint does not show a statistically significant difference.")
+            else:
+                st.info("Please select an endpoint to visualize")
+        else:
+            st.info("No endpoints available with data for both arms")
+    else:
+        st.info("No endpoint data available for this trial")
+
+# Function to render the baseline measures table and balance check for a trial
+@st.fragment
+def render_baseline_tab(trial_data):
+    px, go = _plotly()
+    if trial_data["baseline_measures"]:
+        baseline_df = trial_table(trial_data["clinical_study"]["nct_identifier"], "baseline_measures")
+        
+        # Display baseline measures table with improved styling
+        with st.container(border=True):
+            st.dataframe(
+                baseline_df,
+                use_container_width=True,
+                column_config=BASELINE_COLUMN_CONFIG
+            )
+        
+        # Create baseline visualization if data is available
+        if not baseline_df.empty:
+            st.markdown("<h3>Baseline Comparison</h3>", unsafe_allow_html=True)
+            
+            # Get unique measures
+            measures = baseline_df["name"].unique()
+            
+            if len(measures) > 0:
+                selected_measure = st.selectbox(
+                    "Select baseline measure to visualize",
+                    measures,
+                    key="baseline_select"
+                )
+                
+                # Filter for selected measure, keeping the first row per arm indexed by arm
+                measure_data = baseline_df[baseline_df["name"] == selected_measure].drop_duplicates("arm").set_index("arm")
+                
+                # Check if we have data for both arms
+                if "intervention" in measure_data.index and "placebo" in measure_data.index:
+                    # Create comparison chart
+                    fig = go.Figure()
                     
-                    study_info = data.get("clinical_study", {})
-                    nct_id = study_info.get("nct_identifier", "")
-                    title = study_info.get("title", "")
-                    sponsor = study_info.get("sponsor", "")
+                    for arm in ["intervention", "placebo"]:
+                        arm_data = measure_data.loc[arm]
+                        
+                        fig.add_trace(go.Bar(
+                            x=[arm.capitalize()],
+                            y=[arm_data["average_value"]],
+                            name=arm.capitalize(),
+                            marker_color='#1976D2' if arm == "intervention" else '#90CAF9',
+                            text=[f"{arm_data['average_value']}"],
+                            textposition="outside",
+                            error_y=error_bars(arm_data)
+                        ))
                     
-                    for endpoint in data.get("endpoints", []):
-                        if endpoint_name.lower() in endpoint.get("name", "").lower():
-                            # Skip if placebo not included
-                            if not include_placebo and endpoint.get("arm") == "placebo":
-                                continue
-                            
-                            endpoint_data.append({
-                                "nct_id": nct_id,
-                                "study_title": title,
-                                "sponsor": sponsor,
-                                "endpoint_name": endpoint.get("name", ""),
-                                "arm": endpoint.get("arm", ""),
-                                "timepoint": endpoint.get("timepoint", ""),
-                                "value": endpoint.get("average_value"),
-                                "upper_end": endpoint.get("upper_end"),
-                                "lower_end": endpoint.get("lower_end"),
-                                "p_value": endpoint.get("statistical_significance", "")
-                            })
-                
-                return endpoint_data
-            except Exception as file_e:
-                st.error(f"❌ Failed to load endpoint data: {str(file_e)}")
-                return []
+                    fig.update_layout(
+                        title=f"Baseline {selected_measure} Comparison",
+                        xaxis_title="Arm",
+                        yaxis_title=f"{selected_measure} Value",
+                        barmode='group',
+                        height=400,
+                        uirevision="trial-baseline",
+                        plot_bgcolor='white',
+                        font=CHART_FONT
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True, key="trial_baseline_fig")
+                    
+                    # Add balancing assessment
+                    int_value = measure_data.at["intervention", "average_value"]
+                    pla_value = measure_data.at["placebo", "average_value"]
+                    arm_mean = abs(int_value + pla_value) * 0.5
+                    pct_diff = abs(int_value - pla_value) / arm_mean * 100 if arm_mean else None
+                    
+                    if pct_diff is None:
+                        st.info("ℹ️ Arm balance can't be expressed as a percentage because the arm values average to zero")
+                    elif pct_diff < 5:
+                        st.success(f"✅ Arms are well balanced for this measure (Difference: {pct_diff:.1f}%)")
+                    elif pct_diff < 10:
+                        st.warning(f"⚠️ Arms show some imbalance for this measure (Difference: {pct_diff:.1f}%)")
+                    else:
+                        st.error(f"❌ Arms are notably imbalanced for this measure (Difference: {pct_diff:.1f}%)")
+                else:
+                    st.info("Baseline data not available for both arms")
+    else:
+        st.info("No baseline data available for this trial")
 
 # ---- SIDEBAR & NAVIGATION ----
 with st.sidebar:
@@ -324,12 +1004,12 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("<div class='footer'>Developed for Clinical Trials & Corporate Disclosure Extraction Pipeline</div>", unsafe_allow_html=True)
 
-# ---- LOAD TRIALS DATA ----
-trials = load_trials()
+# ---- PAGES ----
+# Interactive pages are fragments, so widgets inside a page rerun only that page
 
-# ---- MAIN CONTENT ----
-# Trials Overview Page
-if page == "Trials Overview":
+# Function to render the Trials Overview page
+@st.fragment
+def render_trials_overview(trials, display_limit):
     # Main title
     st.markdown("<h1 class='main-header'>Clinical Trials Overview</h1>", unsafe_allow_html=True)
     st.markdown("<p>Comprehensive analysis of PAH clinical trials with their key metrics and distributions.</p>", unsafe_allow_html=True)
@@ -338,35 +1018,34 @@ if page == "Trials Overview":
         # Convert to DataFrame for display
         df_trials = pd.DataFrame(trials)
         
+        # Lowercased search text built once; fields are joined with a separator so matches can't span them
+        df_trials["_search_blob"] = (
+            df_trials["title"].fillna("") + "\x1f" +
+            df_trials["nct_identifier"].fillna("") + "\x1f" +
+            df_trials["indication"].fillna("")
+        ).str.lower()
+        
         # Key metrics section
         st.markdown("<h2 class='section-header'>Key Metrics</h2>", unsafe_allow_html=True)
         
-        # Create three metric cards in columns
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-label'>Total Trials</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{len(df_trials)}</div>", unsafe_allow_html=True)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-label'>Average Participants</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{round(df_trials['number_of_participants'].mean())}</div>", unsafe_allow_html=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+        # Tally sponsors and phases in one pass over the raw records
+        sponsor_c = Counter(t["sponsor"] for t in trials if t.get("sponsor") is not None)
+        phase_c = Counter(t["phase"] for t in trials if t.get("phase") is not None)
+        participants = [t["number_of_participants"] for t in trials if t.get("number_of_participants") is not None]
+        ages = [t["average_age"] for t in trials if t.get("average_age") is not None]
         
-        with col3:
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-label'>Average Age</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{round(df_trials['average_age'].mean(), 1)}</div>", unsafe_allow_html=True)
-            st.markdown("</div>", unsafe_allow_html=True)
-            
-        with col4:
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-label'>Unique Sponsors</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{df_trials['sponsor'].nunique()}</div>", unsafe_allow_html=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+        # Create four metric cards in columns, one markdown call per card
+        metrics = [
+            ("Total Trials", len(trials)),
+            ("Average Participants", round(sum(participants) / len(participants)) if participants else 0),
+            ("Average Age", round(sum(ages) / len(ages), 1) if ages else 0),
+            ("Unique Sponsors", len(sponsor_c))
+        ]
+        for col, (label, value) in zip(st.columns(4), metrics):
+            col.markdown(
+                f"<div class='card'><div class='metric-label'>{label}</div><div class='metric-value'>{value}</div></div>",
+                unsafe_allow_html=True
+            )
             
         # Interactive plots section
         st.markdown("<h2 class='section-header'>Trial Distribution Analysis</h2>", unsafe_allow_html=True)
@@ -375,108 +1054,25 @@ if page == "Trials Overview":
         
         with col1:
             # Interactive sponsor bar chart
-            sponsor_counts = df_trials["sponsor"].value_counts().reset_index()
-            sponsor_counts.columns = ["Sponsor", "Count"]
+            sponsor_records = [{"Sponsor": k, "Count": v} for k, v in sponsor_c.most_common()]
             
-            # Improved bar chart
-            fig = px.bar(
-                sponsor_counts,
-                x="Count",
-                y="Sponsor",
-                title="Trials by Sponsor",
-                color="Count",
-                color_continuous_scale="Blues",
-                orientation='h'
-            )
-            
-            fig.update_layout(
-                height=400,
-                yaxis_title="",
-                xaxis_title="Number of Trials",
-                coloraxis_showscale=False,
-                title_font_size=18,
-                font=dict(family="Arial", size=12),
-                title_font_family="Arial",
-                title_x=0.5,
-                margin=dict(l=20, r=20, t=50, b=20),
-                plot_bgcolor='white'
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(orjson.loads(sponsor_bar_json(sponsor_records)), use_container_width=True)
         
         with col2:
             # Phase distribution pie chart with better colors
-            phase_counts = df_trials["phase"].value_counts().reset_index()
-            phase_counts.columns = ["Phase", "Count"]
-            
-            # Custom color sequence
-            color_sequence = ['#1f77b4', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22']
+            phase_records = [{"Phase": k, "Count": v} for k, v in phase_c.most_common()]
             
-            fig = px.pie(
-                phase_counts,
-                names="Phase",
-                values="Count",
-                title="Trial Phase Distribution",
-                color_discrete_sequence=color_sequence,
-                hole=0.4
-            )
-            
-            fig.update_layout(
-                height=400,
-                legend_title="",
-                title_font_size=18,
-                font=dict(family="Arial", size=12),
-                title_font_family="Arial",
-                title_x=0.5,
-                margin=dict(l=20, r=20, t=50, b=20)
-            )
-            
-            # Add percentage labels
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(orjson.loads(phase_pie_json(phase_records)), use_container_width=True)
         
         # Participants by trial chart
         st.markdown("<h2 class='section-header'>Participant Analysis</h2>", unsafe_allow_html=True)
         
         # Sort trials by number of participants
         df_participants = df_trials.sort_values(by="number_of_participants", ascending=False)
-        df_participants = df_participants.head(10)  # Top 10 by participants
-        
-        # Create bar chart with enhanced styling
-        fig = px.bar(
-            df_participants,
-            x="nct_identifier",
-            y="number_of_participants",
-            title="Number of Participants by Trial (Top 10)",
-            color="number_of_participants",
-            color_continuous_scale="Viridis",
-            labels={"nct_identifier": "Trial ID", "number_of_participants": "Number of Participants"}
-        )
-        
-        # Add trial titles as hover text
-        fig.update_traces(
-            hovertemplate="<b>%{x}</b><br>" +
-                         "Trial: %{customdata}<br>" +
-                         "Participants: %{y}<extra></extra>",
-            customdata=df_participants["title"].tolist()
-        )
+        df_participants = df_participants.head(display_limit)  # Top trials by participants
         
-        fig.update_layout(
-            height=500,
-            xaxis_title="Clinical Trial",
-            yaxis_title="Number of Participants",
-            coloraxis_showscale=False,
-            title_font_size=18,
-            font=dict(family="Arial", size=12),
-            title_font_family="Arial",
-            title_x=0.5,
-            xaxis_tickangle=-45,
-            margin=dict(l=20, r=20, t=50, b=100),
-            plot_bgcolor='white'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        participant_records = df_participants[["nct_identifier", "number_of_participants", "title"]].to_dict("records")
+        st.plotly_chart(orjson.loads(participants_bar_json(participant_records)), use_container_width=True)
         
         # Detailed trial data with filtering
         st.markdown("<h2 class='section-header'>Trial Data Explorer</h2>", unsafe_allow_html=True)
@@ -490,44 +1086,36 @@ if page == "Trials Overview":
         with col3:
             search_term = st.text_input("Search Trials", "")
         
-        # Apply filters
-        filtered_df = df_trials.copy()
+        # Apply filters as one boolean mask, copying the matching rows once at the end
+        mask = np.ones(len(df_trials), dtype=bool)
         
         if selected_sponsors:
-            filtered_df = filtered_df[filtered_df["sponsor"].isin(selected_sponsors)]
+            mask &= df_trials["sponsor"].isin(selected_sponsors).to_numpy()
             
         if selected_phases:
-            filtered_df = filtered_df[filtered_df["phase"].isin(selected_phases)]
+            mask &= df_trials["phase"].isin(selected_phases).to_numpy()
             
         if search_term:
-            search_mask = (
-                filtered_df["title"].str.contains(search_term, case=False) | 
-                filtered_df["nct_identifier"].str.contains(search_term, case=False) |
-                filtered_df["indication"].str.contains(search_term, case=False)
-            )
-            filtered_df = filtered_df[search_mask]
+            mask &= df_trials["_search_blob"].str.contains(search_term.lower(), regex=False, na=False).to_numpy(dtype=bool)
         
-        # Display filtered dataframe
-        st.markdown("<div class='dataframe-container'>", unsafe_allow_html=True)
-        st.dataframe(
-            filtered_df[["nct_identifier", "title", "sponsor", "phase", "indication", "number_of_participants"]],
-            use_container_width=True,
-            column_config={
-                "nct_identifier": "NCT ID",
-                "title": "Trial Title",
-                "sponsor": "Sponsor",
-                "phase": "Phase",
-                "indication": "Indication",
-                "number_of_participants": "Participants"
-            },
-            height=400
-        )
-        st.markdown("</div>", unsafe_allow_html=True)
+        filtered_df = df_trials[mask]
+        
+        # Display filtered dataframe, capped at the sidebar limit so each rerun ships a bounded table
+        display_df = filtered_df.head(display_limit)
+        with st.container(border=True):
+            st.dataframe(
+                display_df[["nct_identifier", "title", "sponsor", "phase", "indication", "number_of_participants"]],
+                use_container_width=True,
+                column_config=TRIALS_COLUMN_CONFIG,
+                height=400
+            )
+        if len(filtered_df) > len(display_df):
+            st.caption(f"Showing {len(display_df)} of {len(filtered_df)} matching trials; the CSV export includes all of them.")
         
         # Export data option
         st.download_button(
             label="📊 Export Data as CSV",
-            data=filtered_df.to_csv(index=False).encode('utf-8'),
+            data=df_to_csv(filtered_df.drop(columns="_search_blob")),
             file_name="pah_trials_data.csv",
             mime='text/csv'
         )
@@ -535,8 +1123,9 @@ if page == "Trials Overview":
     else:
         st.error("❌ No trials data available. Please check API connection.")
 
-# Trial Details Page  
-elif page == "Trial Details":
+# Function to render the Trial Details page
+@st.fragment
+def render_trial_details(trials):
     # Main title with styling
     st.markdown("<h1 class='main-header'>Trial Details</h1>", unsafe_allow_html=True)
     st.markdown("<p>Explore comprehensive information about individual clinical trials.</p>", unsafe_allow_html=True)
@@ -561,7 +1150,8 @@ elif page == "Trial Details":
         if selected_trial:
             with st.spinner("Loading trial details..."):
                 nct_id = trial_options[selected_trial]
-                trial_data = load_trial(nct_id)
+                trial_data, trial_notices = load_trial(nct_id)
+                show_notices(trial_notices)
                 
                 if trial_data:
                     # Get main trial info
@@ -575,69 +1165,26 @@ elif page == "Trial Details":
                         st.markdown(f"<h2 class='sub-header'>{study['title']}</h2>", unsafe_allow_html=True)
                         
                         # Information card
-                        st.markdown("<div class='card'>", unsafe_allow_html=True)
-                        st.markdown(f"<p><strong>NCT ID:</strong> {study['nct_identifier']}</p>", unsafe_allow_html=True)
-                        st.markdown(f"<p><strong>Indication:</strong> {study['indication']}</p>", unsafe_allow_html=True)
-                        st.markdown(f"<p><strong>Sponsor:</strong> {study['sponsor']}</p>", unsafe_allow_html=True)
-                        st.markdown(f"<p><strong>Phase:</strong> {study['phase']}</p>", unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
+                        card_html = (
+                            "<div class='card'>"
+                            f"<p><strong>NCT ID:</strong> {study['nct_identifier']}</p>"
+                            f"<p><strong>Indication:</strong> {study['indication']}</p>"
+                            f"<p><strong>Sponsor:</strong> {study['sponsor']}</p>"
+                            f"<p><strong>Phase:</strong> {study['phase']}</p>"
+                            "</div>"
+                        )
+                        st.markdown(card_html, unsafe_allow_html=True)
                     
                     with col2:
                         # Participant metrics with visuals
-                        st.markdown("<div class='card'>", unsafe_allow_html=True)
-                        
-                        # Trial size visualization
-                        labels = ["Participants"]
-                        values = [study["number_of_participants"]]
-                        
-                        fig = go.Figure()
-                        fig.add_trace(go.Bar(
-                            x=labels,
-                            y=values,
-                            marker_color='#1E88E5',
-                            text=values,
-                            textposition='auto',
-                            width=0.5
-                        ))
-                        
-                        fig.update_layout(
-                            title="Trial Size",
-                            height=200,
-                            margin=dict(l=20, r=20, t=40, b=20),
-                            yaxis_title="Count",
-                            xaxis_title="",
-                            showlegend=False,
-                            plot_bgcolor='white'
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        # Arms distribution
-                        arms_data = {
-                            "Arm Type": ["Intervention", "Placebo"],
-                            "Count": [study["study_arms"]["intervention"], study["study_arms"]["placebo"]]
-                        }
-                        arms_df = pd.DataFrame(arms_data)
-                        
-                        fig = px.pie(
-                            arms_df,
-                            names="Arm Type",
-                            values="Count",
-                            color_discrete_sequence=['#1976D2', '#90CAF9'],
-                            hole=0.4
-                        )
-                        
-                        fig.update_layout(
-                            title="Arms Distribution",
-                            height=200,
-                            margin=dict(l=20, r=20, t=40, b=0),
-                            showlegend=True,
-                            legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5)
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        st.markdown("</div>", unsafe_allow_html=True)
+                        with st.container(border=True):
+                            # Trial size visualization
+                            st.plotly_chart(orjson.loads(trial_size_bar_json(study["number_of_participants"])), use_container_width=True)
+                            
+                            # Arms distribution
+                            arms_json = arms_pie_json(study["study_arms"]["intervention"], study["study_arms"]["placebo"])
+                            st.plotly_chart(orjson.loads(arms_json), use_container_width=True)
+                            
                     
                     # Intervention details
                     st.markdown("<h2 class='section-header'>Intervention Details</h2>", unsafe_allow_html=True)
@@ -647,29 +1194,20 @@ elif page == "Trial Details":
                     # Create a more visually appealing card for drug info
                     cols = st.columns(4)
                     
-                    with cols[0]:
-                        st.markdown("<div class='card' style='height: 150px;'>", unsafe_allow_html=True)
-                        st.markdown("<p style='color: #757575; font-size: 0.9rem;'>DRUG NAME</p>", unsafe_allow_html=True)
-                        st.markdown(f"<p style='font-size: 1.2rem; font-weight: 600;'>{drug['name']}</p>", unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
-                        
-                    with cols[1]:
-                        st.markdown("<div class='card' style='height: 150px;'>", unsafe_allow_html=True)
-                        st.markdown("<p style='color: #757575; font-size: 0.9rem;'>DOSAGE</p>", unsafe_allow_html=True)
-                        st.markdown(f"<p style='font-size: 1.2rem; font-weight: 600;'>{drug['dose']}</p>", unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
-                        
-                    with cols[2]:
-                        st.markdown("<div class='card' style='height: 150px;'>", unsafe_allow_html=True)
-                        st.markdown("<p style='color: #757575; font-size: 0.9rem;'>FREQUENCY</p>", unsafe_allow_html=True)
-                        st.markdown(f"<p style='font-size: 1.2rem; font-weight: 600;'>{drug['frequency']}</p>", unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
-                        
-                    with cols[3]:
-                        st.markdown("<div class='card' style='height: 150px;'>", unsafe_allow_html=True)
-                        st.markdown("<p style='color: #757575; font-size: 0.9rem;'>FORMULATION</p>", unsafe_allow_html=True)
-                        st.markdown(f"<p style='font-size: 1.2rem; font-weight: 600;'>{drug['formulation']}</p>", unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
+                    drug_fields = [
+                        ("DRUG NAME", drug['name']),
+                        ("DOSAGE", drug['dose']),
+                        ("FREQUENCY", drug['frequency']),
+                        ("FORMULATION", drug['formulation'])
+                    ]
+                    for col, (label, value) in zip(cols, drug_fields):
+                        col.markdown(
+                            "<div class='card' style='height: 150px;'>"
+                            f"<p style='color: #757575; font-size: 0.9rem;'>{label}</p>"
+                            f"<p style='font-size: 1.2rem; font-weight: 600;'>{value}</p>"
+                            "</div>",
+                            unsafe_allow_html=True
+                        )
                     
                     # Endpoints and baseline measures with tabs
                     st.markdown("<h2 class='section-header'>Trial Outcomes</h2>", unsafe_allow_html=True)
@@ -678,243 +1216,18 @@ elif page == "Trial Details":
                     endpoint_tab, baseline_tab = st.tabs(["📊 Endpoints", "📈 Baseline Measures"])
                     
                     with endpoint_tab:
-                        if trial_data["endpoints"]:
-                            endpoints_df = pd.DataFrame(trial_data["endpoints"])
-                            
-                            # Display endpoints table with improved styling
-                            st.markdown("<div class='dataframe-container'>", unsafe_allow_html=True)
-                            st.dataframe(
-                                endpoints_df,
-                                use_container_width=True,
-                                column_config={
-                                    "name": "Endpoint",
-                                    "arm": "Treatment Arm",
-                                    "timepoint": "Timepoint",
-                                    "average_value": "Value",
-                                    "statistical_significance": "P-value",
-                                    "description": None  # Hide description column
-                                }
-                            )
-                            st.markdown("</div>", unsafe_allow_html=True)
-                            
-                            # Create endpoint visualization
-                            st.markdown("<h3>Endpoint Visualization</h3>", unsafe_allow_html=True)
-                            
-                            # Group by name and arm
-                            endpoint_groups = {}
-                            for endpoint in trial_data["endpoints"]:
-                                name = endpoint["name"]
-                                if name not in endpoint_groups:
-                                    endpoint_groups[name] = {"intervention": None, "placebo": None}
-                                
-                                if endpoint["arm"] == "intervention":
-                                    endpoint_groups[name]["intervention"] = endpoint
-                                elif endpoint["arm"] == "placebo":
-                                    endpoint_groups[name]["placebo"] = endpoint
-                            
-                            # Create comparison plot for endpoints with both arms
-                            valid_endpoints = [name for name, data in endpoint_groups.items() 
-                                             if data["intervention"] and data["placebo"] and 
-                                             data["intervention"]["average_value"] is not None and 
-                                             data["placebo"]["average_value"] is not None]
-                            
-                            if valid_endpoints:
-                                selected_endpoint = st.selectbox(
-                                    "Select endpoint to visualize",
-                                    valid_endpoints,
-                                    key="endpoint_select"
-                                )
-                                
-                                if selected_endpoint:
-                                    endpoint_data = endpoint_groups[selected_endpoint]
-                                    
-                                    # Create comparison bar chart with improved styling
-                                    fig = go.Figure()
-                                    
-                                    # Add intervention bar
-                                    fig.add_trace(go.Bar(
-                                        x=["Intervention"],
-                                        y=[endpoint_data["intervention"]["average_value"]],
-                                        error_y=dict(
-                                            type='data',
-                                            symmetric=False,
-                                            array=[endpoint_data["intervention"]["upper_end"] - endpoint_data["intervention"]["average_value"] 
-                                                  if endpoint_data["intervention"]["upper_end"] is not None else 0],
-                                            arrayminus=[endpoint_data["intervention"]["average_value"] - endpoint_data["intervention"]["lower_end"]
-                                                      if endpoint_data["intervention"]["lower_end"] is not None else 0]
-                                        ) if endpoint_data["intervention"]["upper_end"] is not None or endpoint_data["intervention"]["lower_end"] is not None else None,
-                                        name="Intervention",
-                                        marker_color='#1976D2',
-                                        text=[f"{endpoint_data['intervention']['average_value']}"],
-                                        textposition="outside"
-                                    ))
-                                    
-                                    # Add placebo bar
-                                    fig.add_trace(go.Bar(
-                                        x=["Placebo"],
-                                        y=[endpoint_data["placebo"]["average_value"]],
-                                        error_y=dict(
-                                            type='data',
-                                            symmetric=False,
-                                            array=[endpoint_data["placebo"]["upper_end"] - endpoint_data["placebo"]["average_value"]
-                                                  if endpoint_data["placebo"]["upper_end"] is not None else 0],
-                                            arrayminus=[endpoint_data["placebo"]["average_value"] - endpoint_data["placebo"]["lower_end"]
-                                                      if endpoint_data["placebo"]["lower_end"] is not None else 0]
-                                        ) if endpoint_data["placebo"]["upper_end"] is not None or endpoint_data["placebo"]["lower_end"] is not None else None,
-                                        name="Placebo",
-                                        marker_color='#90CAF9',
-                                        text=[f"{endpoint_data['placebo']['average_value']}"],
-                                        textposition="outside"
-                                    ))
-                                    
-                                    # Calculate difference for treatment effect
-                                    int_value = endpoint_data["intervention"]["average_value"]
-                                    pla_value = endpoint_data["placebo"]["average_value"]
-                                    diff = int_value - pla_value
-                                    
-                                    # Update layout with improved styling
-                                    fig.update_layout(
-                                        title=f"{selected_endpoint} Comparison",
-                                        xaxis_title="Arm",
-                                        yaxis_title=f"{selected_endpoint} Value",
-                                        barmode='group',
-                                        height=450,
-                                        plot_bgcolor='white',
-                                        font=dict(family="Arial", size=12),
-                                        shapes=[
-                                            # Line connecting bars for effect visualization
-                                            dict(
-                                                type='line',
-                                                x0=0, y0=int_value,
-                                                x1=1, y1=pla_value,
-                                                line=dict(color='#616161', width=1, dash='dot')
-                                            )
-                                        ]
-                                    )
-                                    
-                                    # Add p-value annotation
-                                    p_value = endpoint_data["intervention"]["statistical_significance"]
-                                    effect_text = f"Effect: {diff:.2f}"
-                                    
-                                    if p_value:
-                                        p_color = "#4CAF50" if "p<0.05" in p_value or "p=0.05" in p_value else "#F44336"
-                                        fig.add_annotation(
-                                            x=0.5,
-                                            y=max(int_value, pla_value) * 1.1,
-                                            text=f"{effect_text} | {p_value}",
-                                            showarrow=False,
-                                            font=dict(color=p_color, size=14)
-                                        )
-                                    
-                                    st.plotly_chart(fig, use_container_width=True)
-                                    
-                                    # Add p-value interpretation
-                                    if p_value:
-                                        if "p<0.05" in p_value or "p=0.05" in p_value:
-                                            st.success("✅ This endpoint shows a statistically significant difference between intervention and placebo.")
-                                        else:
-                                            st.info("ℹ️ This endpoint does not show a statistically significant difference.")
-                                else:
-                                    st.info("Please select an endpoint to visualize")
-                            else:
-                                st.info("No endpoints available with data for both arms")
-                        else:
-                            st.info("No endpoint data available for this trial")
+                        render_endpoint_tab(trial_data)
                     
                     with baseline_tab:
-                        if trial_data["baseline_measures"]:
-                            baseline_df = pd.DataFrame(trial_data["baseline_measures"])
-                            
-                            # Display baseline measures table with improved styling
-                            st.markdown("<div class='dataframe-container'>", unsafe_allow_html=True)
-                            st.dataframe(
-                                baseline_df,
-                                use_container_width=True,
-                                column_config={
-                                    "name": "Baseline Measure",
-                                    "arm": "Treatment Arm",
-                                    "average_value": "Value",
-                                    "description": None  # Hide description column
-                                }
-                            )
-                            st.markdown("</div>", unsafe_allow_html=True)
-                            
-                            # Create baseline visualization if data is available
-                            if not baseline_df.empty:
-                                st.markdown("<h3>Baseline Comparison</h3>", unsafe_allow_html=True)
-                                
-                                # Get unique measures
-                                measures = baseline_df["name"].unique()
-                                
-                                if len(measures) > 0:
-                                    selected_measure = st.selectbox(
-                                        "Select baseline measure to visualize",
-                                        measures,
-                                        key="baseline_select"
-                                    )
-                                    
-                                    # Filter for selected measure
-                                    measure_data = baseline_df[baseline_df["name"] == selected_measure]
-                                    
-                                    # Check if we have data for both arms
-                                    if "intervention" in measure_data["arm"].values and "placebo" in measure_data["arm"].values:
-                                        # Create comparison chart
-                                        fig = go.Figure()
-                                        
-                                        for arm in ["intervention", "placebo"]:
-                                            arm_data = measure_data[measure_data["arm"] == arm].iloc[0]
-                                            
-                                            fig.add_trace(go.Bar(
-                                                x=[arm.capitalize()],
-                                                y=[arm_data["average_value"]],
-                                                name=arm.capitalize(),
-                                                marker_color='#1976D2' if arm == "intervention" else '#90CAF9',
-                                                text=[f"{arm_data['average_value']}"],
-                                                textposition="outside",
-                                                error_y=dict(
-                                                    type='data',
-                                                    symmetric=False,
-                                                    array=[arm_data["upper_end"] - arm_data["average_value"] 
-                                                          if arm_data["upper_end"] is not None else 0],
-                                                    arrayminus=[arm_data["average_value"] - arm_data["lower_end"]
-                                                              if arm_data["lower_end"] is not None else 0]
-                                                ) if arm_data["upper_end"] is not None or arm_data["lower_end"] is not None else None
-                                            ))
-                                        
-                                        fig.update_layout(
-                                            title=f"Baseline {selected_measure} Comparison",
-                                            xaxis_title="Arm",
-                                            yaxis_title=f"{selected_measure} Value",
-                                            barmode='group',
-                                            height=400,
-                                            plot_bgcolor='white',
-                                            font=dict(family="Arial", size=12)
-                                        )
-                                        
-                                        st.plotly_chart(fig, use_container_width=True)
-                                        
-                                        # Add balancing assessment
-                                        int_value = measure_data[measure_data["arm"] == "intervention"]["average_value"].values[0]
-                                        pla_value = measure_data[measure_data["arm"] == "placebo"]["average_value"].values[0]
-                                        pct_diff = abs(int_value - pla_value) / ((int_value + pla_value) / 2) * 100
-                                        
-                                        if pct_diff < 5:
-                                            st.success(f"✅ Arms are well balanced for this measure (Difference: {pct_diff:.1f}%)")
-                                        elif pct_diff < 10:
-                                            st.warning(f"⚠️ Arms show some imbalance for this measure (Difference: {pct_diff:.1f}%)")
-                                        else:
-                                            st.error(f"❌ Arms are notably imbalanced for this measure (Difference: {pct_diff:.1f}%)")
-                                    else:
-                                        st.info("Baseline data not available for both arms")
-                        else:
-                            st.info("No baseline data available for this trial")
+                        render_baseline_tab(trial_data)
                 else:
                     st.error(f"❌ Could not load details for trial {nct_id}")
     else:
         st.error("❌ No trials data available. Please check API connection.")
 
-# Endpoint Comparison Page
-elif page == "Endpoint Comparison":
+# Function to render the Endpoint Comparison page
+@st.fragment
+def render_endpoint_comparison():
     # Main title with styling
     st.markdown("<h1 class='main-header'>Endpoint Comparison</h1>", unsafe_allow_html=True)
     st.markdown("<p>Compare endpoint outcomes across multiple PAH clinical trials to identify trends and differences in treatment effects.</p>", unsafe_allow_html=True)
@@ -925,20 +1238,11 @@ elif page == "Endpoint Comparison":
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Common endpoints for PAH trials with icons
-        endpoint_options = {
-            "PVR": "Pulmonary Vascular Resistance",
-            "6MWD": "6-Minute Walk Distance",
-            "NT-proBNP": "NT-proBNP Levels", 
-            "WHO FC": "WHO Functional Class", 
-            "CARDIAC OUTPUT": "Cardiac Output"
-        }
-        
         # Create a more visually appealing endpoint selector
         endpoint_name = st.selectbox(
             "Select an endpoint to analyze",
-            list(endpoint_options.keys()),
-            format_func=lambda x: f"{x} - {endpoint_options[x]}"
+            list(ENDPOINT_OPTIONS.keys()),
+            format_func=lambda x: f"{x} - {ENDPOINT_OPTIONS[x]}"
         )
     
     with col2:
@@ -954,66 +1258,45 @@ elif page == "Endpoint Comparison":
     
     if endpoint_name:
         # Add description of the selected endpoint
-        endpoint_descriptions = {
-            "PVR": "Pulmonary Vascular Resistance (PVR) measures the resistance to blood flow through the pulmonary circulation. A decrease indicates improved blood flow.",
-            "6MWD": "6-Minute Walk Distance (6MWD) measures the distance a patient can walk in 6 minutes, indicating exercise capacity and functional status.",
-            "NT-proBNP": "N-terminal pro-brain natriuretic peptide (NT-proBNP) is a biomarker of heart failure and right ventricular dysfunction. Lower values indicate improved heart function.",
-            "WHO FC": "WHO Functional Class (WHO FC) classifies the severity of symptoms and functional limitations in patients with pulmonary hypertension.",
-            "CARDIAC OUTPUT": "Cardiac Output measures the volume of blood pumped by the heart per minute, reflecting heart function."
-        }
-        
-        st.markdown(f"<div class='card'><p>{endpoint_descriptions.get(endpoint_name, '')}</p></div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='card'><p>{ENDPOINT_DESCRIPTIONS.get(endpoint_name, '')}</p></div>", unsafe_allow_html=True)
         
         # Load and process endpoint data
-        endpoint_data = compare_endpoint(endpoint_name, include_placebo)
+        with st.spinner(f"Analyzing {endpoint_name} across trials..."):
+            df, endpoint_notices = compare_endpoint(endpoint_name, include_placebo)
+        show_notices(endpoint_notices)
         
-        if endpoint_data:
-            # Convert to DataFrame
-            df = pd.DataFrame(endpoint_data)
-            
+        if not df.empty:
             # Display results header
             st.markdown(f"<h2 class='section-header'>Results for {endpoint_name}</h2>", unsafe_allow_html=True)
             
             # Enhanced data table
             st.markdown("<h3>Data Summary</h3>", unsafe_allow_html=True)
-            st.markdown("<div class='dataframe-container'>", unsafe_allow_html=True)
-            
-            # Format p-values and show statistical significance
-            def format_p_value(p_val):
-                if pd.isna(p_val) or p_val == "":
-                    return ""
+            with st.container(border=True):
+                summary_df = df.loc[:, ["nct_id", "sponsor", "arm", "value", "p_value"]]
                 
-                if "p<0.05" in str(p_val).lower() or "p=0.05" in str(p_val).lower() or "p<0.001" in str(p_val).lower():
-                    return f"<span style='color: #4CAF50; font-weight: 600;'>{p_val} ✓</span>"
-                else:
-                    return f"<span style='color: #F44336;'>{p_val}</span>"
-            
-            summary_df = df[["nct_id", "sponsor", "arm", "value", "p_value"]].copy()
-            
-            st.dataframe(
-                summary_df,
-                use_container_width=True,
-                column_config={
-                    "nct_id": "Trial ID",
-                    "sponsor": "Sponsor",
-                    "arm": "Treatment Arm",
-                    "value": f"{endpoint_name} Value",
-                    "p_value": st.column_config.Column(
-                        "Statistical Significance",
-                        help="P-values for statistical significance",
-                        width="medium"
-                    )
-                },
-                hide_index=True
-            )
-            st.markdown("</div>", unsafe_allow_html=True)
+                st.dataframe(
+                    summary_df,
+                    use_container_width=True,
+                    column_config={
+                        "nct_id": "Trial ID",
+                        "sponsor": "Sponsor",
+                        "arm": "Treatment Arm",
+                        "value": f"{endpoint_name} Value",
+                        "p_value": st.column_config.Column(
+                            "Statistical Significance",
+                            help="P-values for statistical significance",
+                            width="medium"
+                        )
+                    },
+                    hide_index=True
+                )
             
             # Download option
             col1, col2 = st.columns([1, 5])
             with col1:
                 st.download_button(
                     label="📊 Export Data",
-                    data=df.to_csv(index=False).encode('utf-8'),
+                    data=df_to_csv(df),
                     file_name=f"{endpoint_name}_comparison.csv",
                     mime='text/csv'
                 )
@@ -1021,144 +1304,54 @@ elif page == "Endpoint Comparison":
             # Create visualization based on selected chart type
             st.markdown("<h3>Visualization</h3>", unsafe_allow_html=True)
             
-            # Filter for valid numeric values
-            df_plot = df[pd.notnull(df["value"])].copy()
+            # Coerce values to numbers once and keep the rows that parsed
+            values = pd.to_numeric(df["value"], errors="coerce")
+            df_plot = df.assign(value=values)[values.notna()]
             
             if not df_plot.empty:
                 if chart_type == "Bar Chart":
                     # Improved bar chart visualization
-                    fig = px.bar(
-                        df_plot,
-                        x="nct_id",
-                        y="value",
-                        color="arm",
-                        barmode="group",
-                        color_discrete_map={"intervention": "#1976D2", "placebo": "#90CAF9"},
-                        error_y="upper_end" if "upper_end" in df_plot.columns and not df_plot["upper_end"].isna().all() else None,
-                        error_y_minus="lower_end" if "lower_end" in df_plot.columns and not df_plot["lower_end"].isna().all() else None,
-                        labels={
-                            "nct_id": "Clinical Trial",
-                            "value": f"{endpoint_name} Value",
-                            "arm": "Treatment Arm"
-                        },
-                        title=f"Comparison of {endpoint_name} Across PAH Clinical Trials",
-                        hover_data=["study_title", "sponsor", "timepoint", "p_value"]
-                    )
-                    
-                    # Customize layout
-                    fig.update_layout(
-                        xaxis_tickangle=-45,
-                        legend_title="Treatment Arm",
-                        height=500,
-                        font=dict(family="Arial", size=12),
-                        plot_bgcolor='white',
-                        margin=dict(l=20, r=20, t=50, b=80)
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(orjson.loads(endpoint_bar_json(endpoint_name, include_placebo, frame_key(df_plot), df_plot)), use_container_width=True, key="endpoint_compare_fig")
                     
                 else:  # Treatment Effect
                     if include_placebo and "placebo" in df_plot["arm"].values and "intervention" in df_plot["arm"].values:
                         st.markdown("<h3>Treatment Effect Analysis</h3>", unsafe_allow_html=True)
                         
-                        # Calculate treatment effect
-                        trial_effects = []
-                        for nct_id in df_plot["nct_id"].unique():
-                            trial_data = df_plot[df_plot["nct_id"] == nct_id]
-                            
-                            intervention_rows = trial_data[trial_data["arm"] == "intervention"]
-                            placebo_rows = trial_data[trial_data["arm"] == "placebo"]
-                            
-                            if not intervention_rows.empty and not placebo_rows.empty:
-                                intervention_value = intervention_rows["value"].values[0]
-                                placebo_value = placebo_rows["value"].values[0]
-                                
-                                effect = intervention_value - placebo_value
-                                p_value = intervention_rows["p_value"].values[0] if not intervention_rows.empty else "Unknown"
-                                
-                                is_significant = False
-                                if isinstance(p_value, str) and ("p<0.05" in p_value.lower() or 
-                                                               "p = 0.05" in p_value.lower() or 
-                                                               "p<.05" in p_value.lower()):
-                                    is_significant = True
-                                
-                                trial_effects.append({
-                                    "nct_id": nct_id,
-                                    "study_title": intervention_rows["study_title"].values[0] if not intervention_rows.empty else "",
-                                    "sponsor": intervention_rows["sponsor"].values[0] if not intervention_rows.empty else "",
-                                    "effect": effect,
-                                    "p_value": p_value,
-                                    "is_significant": is_significant,
-                                    "intervention_value": intervention_value,
-                                    "placebo_value": placebo_value
-                                })
+                        # Calculate treatment effect: pair the first intervention and placebo row of each trial
+                        arms = df_plot.drop_duplicates(["nct_id", "arm"]).set_index(["nct_id", "arm"])
+                        df_effects = (
+                            arms.xs("intervention", level="arm")[["study_title", "sponsor", "p_value", "value"]]
+                            .rename(columns={"value": "intervention_value"})
+                            .join(arms.xs("placebo", level="arm")["value"].rename("placebo_value"), how="inner")
+                            .reset_index()
+                        )
+                        df_effects["effect"] = df_effects["intervention_value"] - df_effects["placebo_value"]
                         
-                        if trial_effects:
-                            df_effects = pd.DataFrame(trial_effects)
-                            
+                        df_effects["is_significant"] = is_significant(df_effects["p_value"])
+                        
+                        if not df_effects.empty:
                             # Create enhanced horizontal bar chart
-                            fig = px.bar(
-                                df_effects,
-                                y="nct_id",
-                                x="effect",
-                                orientation="h",
-                                color="is_significant",
-                                color_discrete_map={True: "#4CAF50", False: "#F44336"},
-                                labels={
-                                    "nct_id": "Clinical Trial",
-                                    "effect": f"Effect Size (Intervention - Placebo)",
-                                    "is_significant": "Statistically Significant"
-                                },
-                                title=f"Treatment Effect for {endpoint_name} Across PAH Clinical Trials",
-                                hover_data=["study_title", "sponsor", "p_value", "intervention_value", "placebo_value"]
-                            )
-                            
-                            # Improve the visualization
-                            fig.update_layout(
-                                height=500,
-                                font=dict(family="Arial", size=12),
-                                plot_bgcolor='white',
-                                margin=dict(l=20, r=20, t=50, b=20)
-                            )
-                            
-                            # Add vertical line at x=0
-                            fig.add_shape(
-                                type="line",
-                                x0=0, y0=-0.5,
-                                x1=0, y1=len(df_effects) - 0.5,
-                                line=dict(color="gray", width=2, dash="dash")
-                            )
-                            
-                            # Add p-values as annotations
-                            for i, row in df_effects.iterrows():
-                                fig.add_annotation(
-                                    x=row["effect"] + (0.1 if row["effect"] >= 0 else -0.1),
-                                    y=i,
-                                    text=f"{row['p_value']}",
-                                    showarrow=False,
-                                    font=dict(
-                                        size=10,
-                                        color="#4CAF50" if row['is_significant'] else "#F44336"
-                                    )
-                                )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
+                            st.plotly_chart(orjson.loads(effect_bar_json(endpoint_name, frame_key(df_effects), df_effects)), use_container_width=True, key="endpoint_effect_fig")
                             
                             # Add interpretation
-                            positive_effects = sum(df_effects["effect"] > 0)
-                            significant_effects = sum(df_effects["is_significant"])
-                            
-                            st.markdown("<div class='card'>", unsafe_allow_html=True)
-                            st.markdown("<h3>Analysis Summary</h3>", unsafe_allow_html=True)
-                            st.markdown(f"<p>{positive_effects} out of {len(df_effects)} trials ({positive_effects/len(df_effects)*100:.0f}%) show positive treatment effect for {endpoint_name}.</p>", unsafe_allow_html=True)
-                            st.markdown(f"<p>{significant_effects} out of {len(df_effects)} trials ({significant_effects/len(df_effects)*100:.0f}%) show statistically significant results.</p>", unsafe_allow_html=True)
+                            positive_effects = int((df_effects["effect"] > 0).sum())
+                            significant_effects = int(df_effects["is_significant"].sum())
                             
                             if positive_effects > len(df_effects) / 2:
-                                st.markdown("<p class='status-success'>✅ Majority of trials show positive treatment effect</p>", unsafe_allow_html=True)
+                                status_html = "<p class='status-success'>✅ Majority of trials show positive treatment effect</p>"
                             else:
-                                st.markdown("<p class='status-warning'>⚠️ Less than half of trials show positive treatment effect</p>", unsafe_allow_html=True)
-                                
-                            st.markdown("</div>", unsafe_allow_html=True)
+                                status_html = "<p class='status-warning'>⚠️ Less than half of trials show positive treatment effect</p>"
+                            
+                            # Emit the whole summary card in one markdown call
+                            summary_html = (
+                                "<div class='card'>"
+                                "<h3>Analysis Summary</h3>"
+                                f"<p>{positive_effects} out of {len(df_effects)} trials ({positive_effects/len(df_effects)*100:.0f}%) show positive treatment effect for {endpoint_name}.</p>"
+                                f"<p>{significant_effects} out of {len(df_effects)} trials ({significant_effects/len(df_effects)*100:.0f}%) show statistically significant results.</p>"
+                                f"{status_html}"
+                                "</div>"
+                            )
+                            st.markdown(summary_html, unsafe_allow_html=True)
                             
                     else:
                         st.warning("Treatment effect comparison requires both intervention and placebo arm data.")
@@ -1167,13 +1360,11 @@ elif page == "Endpoint Comparison":
         else:
             st.warning(f"No data found for endpoint: {endpoint_name}")
 
-# About page
-elif page == "About":
-    st.markdown("<h1 class='main-header'>About This Dashboard</h1>", unsafe_allow_html=True)
-    
-    # Create a card layout
-    st.markdown("<div class='card'>", unsafe_allow_html=True)
-    st.markdown("""
+# Static About page markup: cards stand in for bordered containers and card-row for the two columns
+ABOUT_HTML = """
+<h1 class='main-header'>About This Dashboard</h1>
+
+<div class='card'>
     <h2>Clinical Trial & Corporate Disclosure Extraction Pipeline</h2>
     
     <p>This interactive dashboard visualizes data from industry-sponsored interventional clinical trials
@@ -1188,15 +1379,10 @@ elif page == "About":
         <li><strong>Data Analysis</strong> - Rich metadata on endpoints, arms, drug regimens, and baseline characteristics is analyzed</li>
         <li><strong>Visualization</strong> - Interactive visualizations provide insights across multiple trials</li>
     </ol>
-    """, unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Create two column layout for additional information
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.markdown("""
+</div>
+
+<div class='card-row'>
+    <div class='card'>
         <h3>Data Sources</h3>
         <ul>
             <li><strong>ClinicalTrials.gov API</strong> - Primary source for trial data</li>
@@ -1211,12 +1397,9 @@ elif page == "About":
             <li>Baseline characteristics assessment</li>
             <li>Trial metadata exploration</li>
         </ul>
-        """, unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+    </div>
     
-    with col2:
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.markdown("""
+    <div class='card'>
         <h3>Technologies Used</h3>
         <ul>
             <li><strong>Backend</strong>: FastAPI, SQLAlchemy, PostgreSQL</li>
@@ -1232,12 +1415,10 @@ elif page == "About":
             <li>Integration with additional data sources</li>
             <li>Enhanced natural language processing for publication data extraction</li>
         </ul>
-        """, unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Add project information and acknowledgements
-    st.markdown("<div class='card'>", unsafe_allow_html=True)
-    st.markdown("""
+    </div>
+</div>
+
+<div class='card'>
     <h3>Project Implementation</h3>
     <p>This project was implemented as part of a technical assignment to demonstrate capabilities
     in data extraction, processing, and visualization. The pipeline is designed to be modular,
@@ -1245,12 +1426,34 @@ elif page == "About":
     
     <p>The dashboard provides an intuitive interface for researchers and analysts to compare
     clinical trial outcomes, identify trends, and assess treatment efficacy across multiple studies.</p>
-    """, unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Add contact information in footer
-    st.markdown("<div class='footer'>", unsafe_allow_html=True)
-    st.markdown("© 2025 Clinical Trial Analytics | All data sourced from ClinicalTrials.gov and public sources", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+</div>
+
+<div class='footer'>© 2025 Clinical Trial Analytics | All data sourced from ClinicalTrials.gov and public sources</div>
+"""
+
+# Function to collapse the About page into one line of HTML once per process, so the page
+# is sent as a single element and the indentation is never read as a Markdown code block
+@st.cache_resource
+def about_html():
+    return re.sub(r">\s+<", "><", re.sub(r"\s+", " ", ABOUT_HTML)).strip()
+
+# Function to render the static About page
+def render_about():
+    st.markdown(about_html(), unsafe_allow_html=True)
+
+# ---- LOAD TRIALS DATA ----
+with st.spinner("Loading clinical trial data..."):
+    trials, load_notices = load_trials()
+show_notices(load_notices)
+
+# ---- MAIN CONTENT ----
+if page == "Trials Overview":
+    render_trials_overview(trials, display_limit)
+elif page == "Trial Details":
+    render_trial_details(trials)
+elif page == "Endpoint Comparison":
+    render_endpoint_comparison()
+elif page == "About":
+    render_about()
 
 # Run with: streamlit run src/streamlit/app.py
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Configuration utilities for the Clinical Trial & Corporate Disclosure Extraction Pipeline.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import orjson
+
+from src.utils.paths import get_project_root
+
+@dataclass(frozen=True, slots=True)
+class DatabaseConfig:
+    """Database connection settings, read-only once loaded."""
+    
+    user: str
+    password: str
+    host: str
+    port: int
+    database: str
+    
+    @property
+    def url(self):
+        """Get the PostgreSQL connection string for the psycopg 3 driver."""
+        return f"postgresql+psycopg://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+
+# Parse config/config.json once per process
+@lru_cache(maxsize=1)
+def load_config():
+    """Load the project configuration from config/config.json."""
+    with open(os.path.join(get_project_root(), "config", "config.json"), "rb") as f:
+        return orjson.loads(f.read())
+
+@lru_cache(maxsize=1)
+def get_database_config():
+    """Get the database section of the configuration."""
+    db_config = load_config()["database"]
+    return DatabaseConfig(
+        user=db_config.get("user"),
+        password=db_config.get("password"),
+        host=db_config.get("host"),
+        port=db_config.get("port"),
+        database=db_config.get("database")
+    )
@@ -6,95 +6,115 @@ import os
 import sys
 from pathlib import Path
 
+# Resolve the project layout once at import: utils -> src -> project_root
+_ROOT = Path(__file__).resolve().parents[2]
+_DATA = _ROOT / "data"
+_RAW = _DATA / "raw"
+_OUT = _DATA / "outputs"
+_SEC = _RAW / "sec_filings"
+
+# Directory paths as plain strings, fixed for the life of the process
+PROJECT_ROOT = str(_ROOT)
+DATA_DIR = str(_DATA)
+RAW_DIR = str(_RAW)
+PROCESSED_DIR = str(_DATA / "processed")
+OUTPUTS_DIR = str(_OUT)
+JSON_DIR = str(_OUT / "json")
+VISUALIZATIONS_DIR = str(_OUT / "visualizations")
+CLINICAL_TRIALS_DIR = str(_RAW / "clinical_trials")
+SEC_FILINGS_DIR = str(_SEC)
+PUBLICATIONS_DIR = str(_RAW / "publications")
+DIR_10K = str(_SEC / "10k")
+DIR_8K = str(_SEC / "8k")
+
 # Get the project root directory
 def get_project_root():
     """Get the absolute path to the project root directory."""
-    # Get the directory of this file
-    current_file = os.path.abspath(__file__)
-    # Go up two levels: utils -> src -> project_root
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
-    return project_root
+    return PROJECT_ROOT
 
 # Define paths for various data directories
 def get_data_dir():
     """Get the path to the data directory."""
-    return os.path.join(get_project_root(), "data")
+    return DATA_DIR
 
 def get_raw_dir():
     """Get the path to the raw data directory."""
-    return os.path.join(get_data_dir(), "raw")
+    return RAW_DIR
 
 def get_processed_dir():
     """Get the path to the processed data directory."""
-    return os.path.join(get_data_dir(), "processed")
+    return PROCESSED_DIR
 
 def get_outputs_dir():
     """Get the path to the outputs directory."""
-    return os.path.join(get_data_dir(), "outputs")
+    return OUTPUTS_DIR
 
 def get_json_dir():
     """Get the path to the JSON output directory."""
-    return os.path.join(get_outputs_dir(), "json")
+    return JSON_DIR
 
 def get_visualizations_dir():
     """Get the path to the visualizations directory."""
-    return os.path.join(get_outputs_dir(), "visualizations")
+    return VISUALIZATIONS_DIR
 
 def get_clinical_trials_dir():
     """Get the path to the clinical trials raw data directory."""
-    return os.path.join(get_raw_dir(), "clinical_trials")
+    return CLINICAL_TRIALS_DIR
 
 def get_sec_filings_dir():
     """Get the path to the SEC filings raw data directory."""
-    return os.path.join(get_raw_dir(), "sec_filings")
+    return SEC_FILINGS_DIR
 
 def get_publications_dir():
     """Get the path to the publications raw data directory."""
-    return os.path.join(get_raw_dir(), "publications")
+    return PUBLICATIONS_DIR
 
 def get_10k_dir():
     """Get the path to the 10-K filings directory."""
-    return os.path.join(get_sec_filings_dir(), "10k")
+    return DIR_10K
 
 def get_8k_dir():
     """Get the path to the 8-K filings directory."""
-    return os.path.join(get_sec_filings_dir(), "8k")
+    return DIR_8K
 
 # Create all required directories
 def create_directories():
     """Create all required directories for the project."""
+    # Only the leaves are needed: makedirs creates every missing parent
     directories = [
-        get_data_dir(),
-        get_raw_dir(),
         get_processed_dir(),
-        get_outputs_dir(),
         get_json_dir(),
         get_visualizations_dir(),
         get_clinical_trials_dir(),
-        get_sec_filings_dir(),
         get_publications_dir(),
         get_10k_dir(),
         get_8k_dir()
     ]
     
+    # On repeat runs every leaf exists, so one stat each replaces makedirs' mkdir attempt
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
 
 # Create a script to verify all paths
 def print_all_paths():
     """Print all project paths for verification."""
-    print("Project root:", get_project_root())
-    print("Data directory:", get_data_dir())
-    print("Raw data directory:", get_raw_dir())
-    print("Processed data directory:", get_processed_dir())
-    print("Outputs directory:", get_outputs_dir())
-    print("JSON directory:", get_json_dir())
-    print("Visualizations directory:", get_visualizations_dir())
-    print("Clinical trials directory:", get_clinical_trials_dir())
-    print("SEC filings directory:", get_sec_filings_dir())
-    print("Publications directory:", get_publications_dir())
-    print("10-K filings directory:", get_10k_dir())
-    print("8-K filings directory:", get_8k_dir())
+    lines = [
+        f"Project root: {get_project_root()}",
+        f"Data directory: {get_data_dir()}",
+        f"Raw data directory: {get_raw_dir()}",
+        f"Processed data directory: {get_processed_dir()}",
+        f"Outputs directory: {get_outputs_dir()}",
+        f"JSON directory: {get_json_dir()}",
+        f"Visualizations directory: {get_visualizations_dir()}",
+        f"Clinical trials directory: {get_clinical_trials_dir()}",
+        f"SEC filings directory: {get_sec_filings_dir()}",
+        f"Publications directory: {get_publications_dir()}",
+        f"10-K filings directory: {get_10k_dir()}",
+        f"8-K filings directory: {get_8k_dir()}"
+    ]
+    # One write instead of a print per line
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     # Create all directories when run directly
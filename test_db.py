@@ -1,32 +1,21 @@
 """
 Test PostgreSQL connection directly.
 """
-import os
-import sys
-import json
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(current_dir)
-
 from sqlalchemy import create_engine, text
+from src.utils.config import get_database_config
 
 def main():
     """Test PostgreSQL connection."""
-    # Load config
-    config_path = os.path.join(current_dir, "config", "config.json")
-    with open(config_path, "r") as f:
-        config = json.load(f)
-    db_config = config["database"]
-    
-    # Create connection string
-    connection_string = (
-        f"postgresql://{db_config.get('user')}:{db_config.get('password')}"
-        f"@{db_config.get('host')}:{db_config.get('port')}/{db_config.get('database')}"
-    )
-    
     # Try to connect
     try:
         print("Attempting to connect to PostgreSQL...")
-        engine = create_engine(connection_string)
+        engine = create_engine(
+            get_database_config().url,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=True,
+            pool_recycle=1800
+        )
         
         # Test connection with simple query
         with engine.connect() as conn:
@@ -40,14 +29,22 @@ def main():
                 FROM pg_catalog.pg_tables 
                 WHERE schemaname = 'public'
             """))
-            tables = [row[0] for row in result]
+            tables = result.scalars().all()
             print(f"Tables in database: {tables}")
             
-            # Check trial count
+            # Check trial count: read the planner's row estimate instead of scanning the table,
+            # and count exactly only if the table has never been analyzed (reltuples = -1)
             if 'clinical_study' in tables:
-                result = conn.execute(text("SELECT COUNT(*) FROM clinical_study"))
+                result = conn.execute(text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'public.clinical_study'::regclass"
+                ))
                 count = result.scalar()
-                print(f"Found {count} clinical trials in the database")
+                if count is None or count < 0:
+                    result = conn.execute(text("SELECT COUNT(*) FROM clinical_study"))
+                    count = result.scalar()
+                    print(f"Found {count} clinical trials in the database")
+                else:
+                    print(f"Found about {count} clinical trials in the database")
         
         print("PostgreSQL connection test successful!")
         
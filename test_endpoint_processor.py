@@ -0,0 +1,18 @@
+"""
+Test p-value significance parsing.
+"""
+import pytest
+
+from src.data_processors.endpoint_processor import is_significant_p_value
+
+@pytest.mark.parametrize("p_value, expected", [
+    ("p<0.001", True),
+    ("p=0.05", True),
+    ("p<=0.01", True),
+    ("P≤0.05", True),
+    (None, False),
+    ("NS", False),
+])
+def test_is_significant_p_value(p_value, expected):
+    """Check the p-value notations found in trial results."""
+    assert is_significant_p_value(p_value) is expected
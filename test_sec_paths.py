@@ -3,13 +3,9 @@ Test SEC file paths to ensure they're correct.
 """
 
 import os
-import sys
-
-# Add the src directory to the Python path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(current_dir)
 
 from src.data_fetchers.sec_fetcher import SECFetcher
+from src.utils.paths import DIR_10K, DIR_8K
 
 def main():
     """Test SEC file paths."""
@@ -43,10 +39,7 @@ def main():
         sec_fetcher.download_filing_content(test_filing)
         
         # Verify that the file was created
-        if form_type == "10-K":
-            save_dir = sec_fetcher.raw_10k_dir
-        else:
-            save_dir = sec_fetcher.raw_8k_dir
+        save_dir = DIR_10K if form_type == "10-K" else DIR_8K
         
         clean_accession = test_filing["accession_number"].replace("-", "")
         filename = f"{test_filing['cik']}_{clean_accession}_{form_type}.txt"
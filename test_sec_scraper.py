@@ -3,13 +3,9 @@ Test SEC scraper to ensure it can retrieve real filings.
 """
 
 import os
-import sys
-
-# Add the src directory to the Python path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(current_dir)
 
 from src.data_fetchers.sec_fetcher import SECFetcher
+from src.utils.paths import PROJECT_ROOT
 
 def main():
     """Test the SEC scraper with a real company."""
@@ -50,7 +46,7 @@ def main():
             print("Success! Downloaded a real SEC filing")
             
             # Save a sample
-            sample_path = os.path.join(current_dir, "sec_filing_sample.txt")
+            sample_path = os.path.join(PROJECT_ROOT, "sec_filing_sample.txt")
             with open(sample_path, "w", encoding="utf-8") as f:
                 f.write(content[:1000])  # Save first 1000 characters
             